@@ -0,0 +1,76 @@
+"""
+Compare startup cost of a JSON agent list and a memory-mapped ``Catalog``.
+
+Loading JSON parses every record and builds every ``AgentDetails`` in each
+process. Opening a catalog maps the file and reads its header; agents are
+built only when they are looked up.
+
+Run with::
+
+    python benchmarks/catalog_open.py
+"""
+import json
+import os
+import tempfile
+import time
+
+from payelink_agent_search.catalog import Catalog
+from payelink_agent_search.models import AgentDetails
+
+AGENTS = 100_000
+
+
+def _agents():
+    return [
+        {
+            "agent_id": f"agent-{i:06d}",
+            "agent_name": f"Agent {i}",
+            "agent_description": f"Handles task family {i % 500}",
+            "agent_url": f"https://org{i % 1000}.example.com/agents/{i}",
+            "organization_name": f"Organization {i % 1000}",
+            "organization_url": f"https://org{i % 1000}.example.com",
+        }
+        for i in range(AGENTS)
+    ]
+
+
+def _timed(function):
+    started = time.perf_counter()
+    result = function()
+    return result, (time.perf_counter() - started) * 1e3
+
+
+def main():
+    agents = _agents()
+    with tempfile.TemporaryDirectory() as directory:
+        json_path = os.path.join(directory, "agents.json")
+        catalog_path = os.path.join(directory, "agents.cat")
+        with open(json_path, "w") as f:
+            json.dump(agents, f)
+        Catalog.build(agents, catalog_path)
+
+        def load_json():
+            with open(json_path) as f:
+                return {
+                    record["agent_id"]: AgentDetails(**record)
+                    for record in json.load(f)
+                }
+
+        _, json_ms = _timed(load_json)
+        catalog, verified_ms = _timed(lambda: Catalog.open(catalog_path))
+        catalog.close()
+        catalog, open_ms = _timed(lambda: Catalog.open(catalog_path, verify=False))
+        _, get_ms = _timed(lambda: catalog.get("agent-054321"))
+        catalog.close()
+
+        print(f"{AGENTS} agents")
+        print(f"  JSON size      {os.path.getsize(json_path) / 1e6:8.1f} MB")
+        print(f"  catalog size   {os.path.getsize(catalog_path) / 1e6:8.1f} MB")
+        print(f"  load JSON      {json_ms:8.1f} ms")
+        print(f"  open, verified {verified_ms:8.1f} ms")
+        print(f"  open           {open_ms:8.3f} ms")
+        print(f"  get()          {get_ms:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Compare per-call encoding cost of ``search()`` and ``prepare()``.
+
+``search()`` builds a ``SearchRequest``, validates every field and lets httpx
+JSON-encode the ``model_dump()`` output. A prepared search only encodes the
+query and splices it into the pre-encoded filters.
+
+Run with::
+
+    python benchmarks/prepared_search.py
+"""
+import json
+import timeit
+
+from payelink_agent_search.models import SearchRequest
+from payelink_agent_search.prepared import SearchTemplate
+
+NUMBER = 2000
+
+
+def _filters(url_count):
+    return {
+        "country": "KE",
+        "capability": "streaming",
+        "default_input_mode": ["text/plain"],
+        "default_output_mode": ["application/json"],
+        "allowed_url": [f"https://org{i}.example.com" for i in range(url_count)],
+    }
+
+
+def _per_call_search(filters):
+    def encode():
+        request = SearchRequest(query="Convert USD to KES", max_result=5, **filters)
+        json.dumps(
+            request.model_dump(exclude_none=True),
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ).encode()
+
+    return timeit.timeit(encode, number=NUMBER) / NUMBER
+
+
+def _per_call_prepared(filters):
+    template = SearchTemplate(**filters)
+
+    def encode():
+        template.encode("Convert USD to KES", max_result=5)
+
+    return timeit.timeit(encode, number=NUMBER) / NUMBER
+
+
+def main():
+    print(f"{'allowed_url':>11}  {'search()':>10}  {'prepared':>10}  {'saved':>10}")
+    for url_count in (0, 10, 100, 500, 1000):
+        filters = _filters(url_count)
+        search = _per_call_search(filters) * 1e6
+        prepared = _per_call_prepared(filters) * 1e6
+        print(
+            f"{url_count:>11}  {search:>8.1f}us  {prepared:>8.1f}us  "
+            f"{search - prepared:>8.1f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
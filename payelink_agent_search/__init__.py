@@ -1,7 +1,37 @@
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, Dict, List
+
 from ._version import __version__
-from .client import AgentSearchClient, AsyncAgentSearchClient
-from .errors import SdkError
-from .models import SearchRequest, SearchResponse
+
+if TYPE_CHECKING:
+    from .approximate import ApproximateIndex
+    from .cache import ResponseCache
+    from .catalog import Catalog
+    from .client import AgentSearchClient, AsyncAgentSearchClient
+    from .deadline import Deadline, deadline_scope
+    from .errors import SdkError
+    from .export import export_results
+    from .models import SearchRequest, SearchResponse
+    from .scheduler import RefreshPolicy
+    from .sharding import ShardPolicy
+
+# Public names are resolved on first access so that ``import
+# payelink_agent_search`` does not pull in httpx or pydantic.
+_LAZY_ATTRIBUTES: Dict[str, str] = {
+    "AgentSearchClient": ".client",
+    "AsyncAgentSearchClient": ".client",
+    "SearchRequest": ".models",
+    "SearchResponse": ".models",
+    "SdkError": ".errors",
+    "Deadline": ".deadline",
+    "deadline_scope": ".deadline",
+    "ResponseCache": ".cache",
+    "ApproximateIndex": ".approximate",
+    "ShardPolicy": ".sharding",
+    "RefreshPolicy": ".scheduler",
+    "Catalog": ".catalog",
+    "export_results": ".export",
+}
 
 __all__ = [
     "AgentSearchClient",
@@ -9,5 +39,27 @@ __all__ = [
     "SearchRequest",
     "SearchResponse",
     "SdkError",
+    "Deadline",
+    "deadline_scope",
+    "ResponseCache",
+    "ApproximateIndex",
+    "ShardPolicy",
+    "RefreshPolicy",
+    "Catalog",
+    "export_results",
     "__version__",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
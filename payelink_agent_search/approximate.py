@@ -0,0 +1,169 @@
+import hashlib
+import random
+import re
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+# Mersenne prime used for the MinHash permutations.
+_PRIME = (1 << 61) - 1
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def normalize_text(query: str) -> str:
+    """Lowercase ``query`` and reduce punctuation and symbols to spaces."""
+    return " ".join(_NON_WORD.sub(" ", query.casefold()).split())
+
+
+def shingles(query: str, size: int = 3) -> Set[str]:
+    """Character shingles of the normalized query."""
+    text = normalize_text(query)
+    if len(text) <= size:
+        return {text}
+    return {text[i : i + size] for i in range(len(text) - size + 1)}
+
+
+@dataclass(frozen=True)
+class ShadowMatch:
+    query: str
+    matched_query: str
+    similarity: float
+
+
+class ApproximateIndex:
+    """
+    MinHash/LSH index that matches near-duplicate queries.
+
+    Each query is reduced to a MinHash signature over character shingles.
+    Signatures are split into ``bands``; queries that share a band (and
+    have identical hard filters) are candidates, and a candidate is a match
+    when its estimated Jaccard similarity reaches ``threshold``.
+
+    Parameters
+    ----------
+    threshold : float, default=0.9
+        Minimum estimated similarity for a cached result to be reused.
+
+    num_perm : int, default=64
+        Number of MinHash permutations. Must be divisible by ``bands``.
+
+    bands : int, default=16
+        Number of LSH bands. More bands find more candidates.
+
+    shingle_size : int, default=3
+        Length of the character shingles.
+
+    shadow : bool, default=False
+        Record would-be hits in ``shadow_matches`` and ``stats`` without
+        serving them.
+
+    shadow_log_size : int, default=1000
+        Number of recent shadow matches kept for inspection.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.9,
+        num_perm: int = 64,
+        bands: int = 16,
+        shingle_size: int = 3,
+        shadow: bool = False,
+        shadow_log_size: int = 1000,
+    ) -> None:
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.shingle_size = shingle_size
+        self.shadow = shadow
+        self.shadow_matches: Deque[ShadowMatch] = deque(maxlen=shadow_log_size)
+
+        rng = random.Random(0x5EED)
+        self._permutations = [
+            (rng.randrange(1, _PRIME), rng.randrange(0, _PRIME))
+            for _ in range(num_perm)
+        ]
+        self._rows = num_perm // bands
+        self._buckets: Dict[Tuple[str, int, Tuple[int, ...]], Set[str]] = {}
+        # key -> (query, filters, signature)
+        self._items: Dict[str, Tuple[str, str, Tuple[int, ...]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def signature(self, query: str) -> Tuple[int, ...]:
+        hashes = [
+            int.from_bytes(
+                hashlib.blake2b(shingle.encode(), digest_size=8).digest(), "big"
+            )
+            for shingle in shingles(query, self.shingle_size)
+        ]
+        return tuple(
+            min((a * h + b) % _PRIME for h in hashes)
+            for a, b in self._permutations
+        )
+
+    def similarity(self, left: Tuple[int, ...], right: Tuple[int, ...]) -> float:
+        """Estimated Jaccard similarity of two signatures."""
+        return sum(x == y for x, y in zip(left, right)) / self.num_perm
+
+    def add(self, key: str, query: str, filters: str) -> None:
+        """Index ``query`` under ``key``; ``filters`` must match exactly."""
+        self.remove(key)
+        signature = self.signature(query)
+        self._items[key] = (query, filters, signature)
+        for bucket in self._band_keys(filters, signature):
+            self._buckets.setdefault(bucket, set()).add(key)
+
+    def remove(self, key: str) -> None:
+        item = self._items.pop(key, None)
+        if item is None:
+            return
+        _, filters, signature = item
+        for bucket in self._band_keys(filters, signature):
+            keys = self._buckets.get(bucket)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._buckets[bucket]
+
+    def clear(self) -> None:
+        self._items.clear()
+        self._buckets.clear()
+
+    def match(self, query: str, filters: str) -> Optional[Tuple[str, float]]:
+        """
+        Return the key and similarity of the closest indexed query, if any
+        reaches the threshold.
+        """
+        signature = self.signature(query)
+        candidates: Set[str] = set()
+        for bucket in self._band_keys(filters, signature):
+            candidates.update(self._buckets.get(bucket, ()))
+
+        best: Optional[Tuple[str, float]] = None
+        for key in candidates:
+            score = self.similarity(signature, self._items[key][2])
+            if score >= self.threshold and (best is None or score > best[1]):
+                best = (key, score)
+        return best
+
+    def record_shadow(self, query: str, key: str, similarity: float) -> None:
+        self.shadow_matches.append(
+            ShadowMatch(
+                query=query,
+                matched_query=self._items[key][0],
+                similarity=similarity,
+            )
+        )
+
+    def _band_keys(
+        self, filters: str, signature: Tuple[int, ...]
+    ) -> List[Tuple[str, int, Tuple[int, ...]]]:
+        rows = self._rows
+        return [
+            (filters, band, signature[band * rows : (band + 1) * rows])
+            for band in range(self.bands)
+        ]
@@ -0,0 +1,227 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .approximate import ApproximateIndex
+from .filters import FilterEngine, normalize_query
+from .models import SearchRequest
+
+
+def _key_fields(request: SearchRequest) -> Dict[str, Any]:
+    fields = request.model_dump(exclude_none=True, exclude={"query"})
+    for name, value in fields.items():
+        if isinstance(value, list):
+            fields[name] = sorted(set(value))
+    return fields
+
+
+def request_key(request: SearchRequest) -> str:
+    """
+    Normalized cache key for a request.
+
+    Whitespace in the query is collapsed and list filters are compared as
+    sets, so requests that the API treats identically share a key.
+    """
+    fields = _key_fields(request)
+    fields["query"] = normalize_query(request.query)
+    return json.dumps(fields, sort_keys=True, ensure_ascii=False)
+
+
+def filters_key(request: SearchRequest) -> str:
+    """Normalized key of everything in a request except its query."""
+    return json.dumps(_key_fields(request), sort_keys=True, ensure_ascii=False)
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    request: SearchRequest
+    data: Tuple[Dict[str, Any], ...]
+    message: Optional[str]
+    stored_at: float
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    local_hits: int = 0
+    approximate_hits: int = 0
+    shadow_hits: int = 0
+    misses: int = 0
+
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.local_hits + self.approximate_hits + self.misses
+
+    @property
+    def approximate_hit_rate(self) -> float:
+        return self.approximate_hits / self.lookups if self.lookups else 0.0
+
+    @property
+    def shadow_hit_rate(self) -> float:
+        """Share of lookups an approximate tier in shadow mode would serve."""
+        return self.shadow_hits / self.lookups if self.lookups else 0.0
+
+
+class ResponseCache:
+    """
+    In-memory LRU cache of search results, shared by one or more clients.
+
+    Besides exact hits, the cache can answer a narrower search (same query,
+    more filters or a smaller ``max_result``) from a cached broader result
+    when the agents' metadata allows the extra filters to be evaluated
+    locally. Responses served from the cache have ``served_locally=True``.
+
+    Parameters
+    ----------
+    maxsize : int, default=1024
+        Maximum number of cached results.
+
+    ttl : float, default=300.0
+        Seconds a result stays valid.
+
+    local_filtering : bool, default=True
+        Answer narrower searches from cached broader results when possible.
+
+    approximate : ApproximateIndex, optional
+        Also answer searches whose query is a near-duplicate of a cached
+        one with identical filters. In shadow mode, would-be hits are only
+        counted in ``stats.shadow_hits``.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float = 300.0,
+        local_filtering: bool = True,
+        approximate: Optional[ApproximateIndex] = None,
+    ) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self.approximate = approximate
+        self._filter_engine = FilterEngine() if local_filtering else None
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        # Keys of cached entries grouped by normalized query.
+        self._by_query: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_query.clear()
+            if self.approximate is not None:
+                self.approximate.clear()
+
+    def lookup(self, request: SearchRequest) -> Optional[Dict[str, Any]]:
+        """
+        Return a raw API-style result for ``request``, or None on a miss.
+        """
+        key = request_key(request)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._get(key, now)
+            if entry is not None:
+                self.stats.hits += 1
+                return _raw_result(entry.data, entry.message)
+
+            if self._filter_engine is not None:
+                for candidate_key in list(
+                    self._by_query.get(normalize_query(request.query), ())
+                ):
+                    candidate = self._get(candidate_key, now)
+                    if candidate is None:
+                        continue
+                    data = self._filter_engine.answer(
+                        candidate.request, candidate.data, request
+                    )
+                    if data is not None:
+                        self.stats.local_hits += 1
+                        return _raw_result(data, None)
+
+            if self.approximate is not None:
+                served = self._lookup_approximate(request, now)
+                if served is not None:
+                    return served
+
+            self.stats.misses += 1
+            return None
+
+    def store(self, request: SearchRequest, raw: Dict[str, Any]) -> None:
+        """Cache a successful, complete raw API result for ``request``."""
+        if not raw.get("success") or raw.get("shard_errors"):
+            return
+
+        key = request_key(request)
+        entry = CacheEntry(
+            request=request,
+            data=tuple(raw.get("data", [])),
+            message=raw.get("message"),
+            stored_at=time.monotonic(),
+        )
+
+        with self._lock:
+            if key not in self._entries:
+                query = normalize_query(request.query)
+                self._by_query.setdefault(query, []).append(key)
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            if self.approximate is not None:
+                self.approximate.add(key, request.query, filters_key(request))
+
+            while len(self._entries) > self.maxsize:
+                evicted_key, evicted = self._entries.popitem(last=False)
+                self._unindex(evicted_key, evicted)
+
+    def _lookup_approximate(
+        self, request: SearchRequest, now: float
+    ) -> Optional[Dict[str, Any]]:
+        match = self.approximate.match(request.query, filters_key(request))
+        if match is None:
+            return None
+        key, similarity = match
+        entry = self._get(key, now)
+        if entry is None:
+            return None
+
+        if self.approximate.shadow:
+            self.stats.shadow_hits += 1
+            self.approximate.record_shadow(request.query, key, similarity)
+            return None
+
+        self.stats.approximate_hits += 1
+        return _raw_result(entry.data, entry.message)
+
+    def _get(self, key: str, now: float) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if now - entry.stored_at > self.ttl:
+            del self._entries[key]
+            self._unindex(key, entry)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _unindex(self, key: str, entry: CacheEntry) -> None:
+        if self.approximate is not None:
+            self.approximate.remove(key)
+        query = normalize_query(entry.request.query)
+        keys = self._by_query.get(query)
+        if keys is None:
+            return
+        keys.remove(key)
+        if not keys:
+            del self._by_query[query]
+
+
+def _raw_result(
+    data: Sequence[Dict[str, Any]], message: Optional[str]
+) -> Dict[str, Any]:
+    return {"success": True, "data": list(data), "message": message}
@@ -0,0 +1,319 @@
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Union,
+)
+
+from .errors import CatalogError
+from .models import AgentDetails
+
+MAGIC = b"PLAC"
+VERSION = 1
+
+# Columns stored for each agent, in file order.
+FIELDS = (
+    "agent_id",
+    "agent_name",
+    "agent_description",
+    "agent_url",
+    "organization_name",
+    "organization_url",
+)
+
+# magic, version, field count, agent count, string count, index count,
+# offsets of the string offsets, field columns, index and string data,
+# CRC-32 of everything after the header.
+_HEADER = struct.Struct("<4sHHIIIQQQQI")
+_NONE = 0xFFFFFFFF
+_NATIVE_U32 = sys.byteorder == "little" and array("I").itemsize == 4
+
+AgentRecord = Union[AgentDetails, Mapping[str, Any]]
+
+
+def _u32(buffer: memoryview, offset: int, count: int) -> Sequence[int]:
+    """Little-endian u32 array at ``offset``, without copying when possible."""
+    view = buffer[offset : offset + 4 * count]
+    if _NATIVE_U32:
+        return view.cast("I")
+    # Other platforms get a private copy.
+    values = array("I" if array("I").itemsize == 4 else "L")
+    values.frombytes(view)
+    view.release()
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values
+
+
+def _pack_u32(values: Sequence[int]) -> bytes:
+    return struct.pack(f"<{len(values)}I", *values)
+
+
+class Catalog:
+    """
+    Read-only agent catalog in a memory-mapped binary file.
+
+    A catalog is written once with ``Catalog.build()`` and opened by any
+    number of processes with ``Catalog.open()``. The file is mapped rather
+    than read, so processes on the same host share its pages through the
+    OS page cache and opening does not depend on the number of agents.
+    ``AgentDetails`` are only built when an agent is looked up or iterated.
+
+    The file holds a header (magic, version, counts, section offsets and a
+    CRC-32 checksum), a table of unique strings, one fixed-width column of
+    string numbers per ``AgentDetails`` field, and an index of rows sorted
+    by ``agent_id`` for binary search. All integers are little-endian.
+    """
+
+    def __init__(self, mapping: mmap.mmap, path: str) -> None:
+        self.path = path
+        self._mmap = mapping
+
+        if len(mapping) < _HEADER.size:
+            self._fail("file is too small")
+        (
+            magic,
+            version,
+            field_count,
+            self._count,
+            string_count,
+            index_count,
+            offsets_at,
+            fields_at,
+            index_at,
+            strings_at,
+            self.checksum,
+        ) = _HEADER.unpack_from(mapping)
+        if magic != MAGIC:
+            self._fail("not an agent catalog")
+        if version != VERSION:
+            self._fail(f"unsupported version {version}")
+        if field_count != len(FIELDS):
+            self._fail(f"expected {len(FIELDS)} fields, found {field_count}")
+        if strings_at > len(mapping) or max(
+            offsets_at + 4 * (string_count + 1),
+            fields_at + 4 * field_count * self._count,
+            index_at + 4 * index_count,
+        ) > strings_at:
+            self._fail("section offsets are out of range")
+
+        self._buffer = memoryview(mapping)
+        self._offsets = _u32(self._buffer, offsets_at, string_count + 1)
+        self._columns = [
+            _u32(self._buffer, fields_at + 4 * self._count * i, self._count)
+            for i in range(field_count)
+        ]
+        self._index = _u32(self._buffer, index_at, index_count)
+        self._strings_at = strings_at
+
+    @classmethod
+    def build(
+        cls, agents: Iterable[AgentRecord], path: Union[str, "os.PathLike[str]"]
+    ) -> int:
+        """
+        Write ``agents`` to a catalog file at ``path``.
+
+        ``agents`` holds ``AgentDetails`` or dicts with their fields. The
+        file is written next to ``path`` and moved into place, so processes
+        that have the old catalog open keep a consistent copy. Returns the
+        number of agents written.
+
+        Raises
+        ------
+        ValueError
+            If two agents share an ``agent_id``.
+        """
+        strings: Dict[str, int] = {}
+        columns: List[List[int]] = [[] for _ in FIELDS]
+
+        def intern(value: Optional[str]) -> int:
+            if value is None:
+                return _NONE
+            return strings.setdefault(value, len(strings))
+
+        for agent in agents:
+            if isinstance(agent, AgentDetails):
+                record = agent.model_dump()
+            else:
+                record = AgentDetails(**agent).model_dump()
+            for column, field in zip(columns, FIELDS):
+                column.append(intern(record[field]))
+
+        encoded = [value.encode("utf-8") for value in strings]
+        offsets = [0]
+        for data in encoded:
+            offsets.append(offsets[-1] + len(data))
+        if offsets[-1] >= _NONE:
+            raise ValueError("Catalog string table exceeds 4 GiB")
+
+        # Sort by the UTF-8 bytes of agent_id, as compared when searching.
+        ids = columns[0]
+        index = sorted(
+            (row for row, string in enumerate(ids) if string != _NONE),
+            key=lambda row: encoded[ids[row]],
+        )
+        for previous, row in zip(index, index[1:]):
+            if ids[previous] == ids[row]:
+                raise ValueError(
+                    f"Duplicate agent_id {encoded[ids[row]].decode()!r}"
+                )
+
+        count = len(ids)
+        offsets_at = _HEADER.size
+        fields_at = offsets_at + 4 * len(offsets)
+        index_at = fields_at + 4 * count * len(FIELDS)
+        strings_at = index_at + 4 * len(index)
+
+        body = b"".join(
+            [
+                _pack_u32(offsets),
+                *(_pack_u32(column) for column in columns),
+                _pack_u32(index),
+                *encoded,
+            ]
+        )
+        header = _HEADER.pack(
+            MAGIC,
+            VERSION,
+            len(FIELDS),
+            count,
+            len(encoded),
+            len(index),
+            offsets_at,
+            fields_at,
+            index_at,
+            strings_at,
+            zlib.crc32(body),
+        )
+
+        path = os.fspath(path)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(temporary, "wb") as f:
+                f.write(header)
+                f.write(body)
+            os.replace(temporary, path)
+        except BaseException:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+        return count
+
+    @classmethod
+    def open(
+        cls, path: Union[str, "os.PathLike[str]"], verify: bool = True
+    ) -> "Catalog":
+        """
+        Map the catalog at ``path``.
+
+        With ``verify=True`` the checksum of the whole file is checked,
+        which reads every page once. Pass ``verify=False`` to only check
+        the header when the file is known to be intact.
+
+        Raises
+        ------
+        CatalogError
+            If the file is not a valid catalog.
+        """
+        path = os.fspath(path)
+        with open(path, "rb") as f:
+            try:
+                mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as e:
+                # Empty files cannot be mapped.
+                raise CatalogError(f"Invalid agent catalog {path!r}: {e}") from e
+
+        try:
+            catalog = cls(mapping, path)
+        except BaseException:
+            mapping.close()
+            raise
+        if verify:
+            with catalog._buffer[_HEADER.size :] as body:
+                valid = zlib.crc32(body) == catalog.checksum
+            if not valid:
+                catalog.close()
+                catalog._fail("checksum mismatch")
+        return catalog
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[AgentDetails]:
+        """Agents in the order they were written."""
+        for row in range(self._count):
+            yield self._agent(row)
+
+    def __contains__(self, agent_id: object) -> bool:
+        return isinstance(agent_id, str) and self._find(agent_id) is not None
+
+    def __enter__(self) -> "Catalog":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def get(self, agent_id: str) -> Optional[AgentDetails]:
+        """The agent with ``agent_id``, or None if the catalog has none."""
+        row = self._find(agent_id)
+        return None if row is None else self._agent(row)
+
+    def close(self) -> None:
+        if self._mmap.closed:
+            return
+        # Views into the mapping must be released before it can be closed.
+        for values in (self._offsets, self._index, *self._columns):
+            if isinstance(values, memoryview):
+                values.release()
+        self._buffer.release()
+        self._mmap.close()
+
+    def _find(self, agent_id: str) -> Optional[int]:
+        target = agent_id.encode("utf-8")
+        ids = self._columns[0]
+        index = self._index
+        low, high = 0, len(index)
+        while low < high:
+            middle = (low + high) // 2
+            if self._bytes(ids[index[middle]]) < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(index) and self._bytes(ids[index[low]]) == target:
+            return index[low]
+        return None
+
+    def _agent(self, row: int) -> AgentDetails:
+        # Records were validated when the catalog was built.
+        return AgentDetails.model_construct(
+            **{
+                field: self._string(column[row])
+                for field, column in zip(FIELDS, self._columns)
+            }
+        )
+
+    def _string(self, number: int) -> Optional[str]:
+        if number == _NONE:
+            return None
+        return self._bytes(number).decode("utf-8")
+
+    def _bytes(self, number: int) -> bytes:
+        start = self._strings_at + self._offsets[number]
+        end = self._strings_at + self._offsets[number + 1]
+        if end > len(self._mmap):
+            self._fail("string table is truncated")
+        return self._mmap[start:end]
+
+    def _fail(self, reason: str) -> None:
+        raise CatalogError(f"Invalid agent catalog {self.path!r}: {reason}")
@@ -1,9 +1,59 @@
 import os
-from typing import List, Literal, Optional
-
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Union,
+)
+
+from .cache import ResponseCache
 from .config import ClientConfig
+from .deadline import Deadline, resolve_deadline
+from .errors import SdkError
 from .models import AgentDetails, InputMode, OutputMode, SearchRequest, SearchResponse
-from .transport import AsyncTransport, Transport
+from .prepared import AsyncPreparedSearch, PreparedSearch, SearchTemplate
+from .registry import (
+    DEFAULT_MAX_AGENTS,
+    DEFAULT_MAX_BYTES,
+    RegistryEntry,
+    aiter_registry,
+    iter_registry,
+    registry_url,
+)
+from .sharding import ShardPolicy, merge_shard_results
+
+if TYPE_CHECKING:
+    from .scheduler import (
+        AsyncRefreshScheduler,
+        RefreshPolicy,
+        RefreshScheduler,
+        RegistrySnapshot,
+    )
+    from .warmup import WarmupReport, WarmupSource
+
+SEARCH_PATH = "/v1/agents/search"
+
+
+def _build_response(
+    raw: Dict[str, Any], served_locally: bool = False
+) -> SearchResponse:
+    agents = [AgentDetails(**agent) for agent in raw.get("data", [])]
+
+    return SearchResponse(
+        success=True,
+        agents=agents,
+        message=raw.get("message"),
+        error=None if raw.get("success") else raw.get("error"),
+        served_locally=served_locally,
+        shard_errors=raw.get("shard_errors", []),
+    )
 
 
 class AgentSearchClient:
@@ -24,12 +74,22 @@ class AgentSearchClient:
         API key for authenticating requests. If not provided, the client will
         attempt to read from the PAYELINK_KEY environment variable.
         The API key is sent as a Bearer token in the Authorization header.
+
+    cache : ResponseCache, optional
+        Cache for search results. When set, repeated searches and narrower
+        variants of cached searches are answered without a round trip.
+
+    sharding : ShardPolicy, optional
+        Split searches with long ``allowed_url`` lists into concurrent
+        shard requests and merge their results.
     """
 
     def __init__(
         self,
         retries: int = 2,
         api_key: Optional[str] = None,
+        cache: Optional[ResponseCache] = None,
+        sharding: Optional[ShardPolicy] = None,
     ):
         # Use provided API key or fall back to environment variable
         resolved_api_key = api_key or os.getenv("PAYELINK_KEY")
@@ -38,10 +98,19 @@ class AgentSearchClient:
             retries=retries,
             api_key=resolved_api_key,
         )
+        self._cache = cache
+        self._sharding = sharding
+        self._scheduler: Optional["RefreshScheduler"] = None
+
+        # Imported here so that httpx is only loaded once a client is built.
+        from .transport import Transport
 
         self._transport = Transport(self._config)
 
     def close(self) -> None:
+        if self._scheduler is not None:
+            self._scheduler.stop()
+            self._scheduler = None
         self._transport.close()
 
     def __enter__(self) -> "AgentSearchClient":
@@ -50,6 +119,91 @@ class AgentSearchClient:
     def __exit__(self, exc_type, exc, tb) -> None:
         self.close()
 
+    def iter_registry(
+        self,
+        organization_url: str,
+        *,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_agents: int = DEFAULT_MAX_AGENTS,
+    ) -> Iterator[RegistryEntry]:
+        """
+        Stream an organization's ``/.well-known/agents.json`` registry.
+
+        Entries are yielded while the registry is still downloading: first
+        the ``RegistryOrganization``, then one ``RegistryAgent`` per
+        ``agents[]`` entry. You can start fetching agent cards before the
+        download completes. Memory use is bounded by the size of one entry.
+
+        Parameters
+        ----------
+        organization_url : str
+            Base URL of the organization, e.g. "https://acme.com".
+
+        max_bytes : int, default=5 MiB
+            Maximum size of the registry document.
+
+        max_agents : int, default=10000
+            Maximum number of agents in the registry.
+
+        Raises
+        ------
+        LimitExceededError
+            If the registry exceeds ``max_bytes`` or ``max_agents``.
+
+        InvalidResponseError
+            If the registry is not a valid ``agents.json`` document.
+        """
+
+        chunks = self._transport.stream_bytes(registry_url(organization_url))
+        return iter_registry(chunks, max_bytes=max_bytes, max_agents=max_agents)
+
+    def watch_registries(
+        self,
+        organization_urls: Iterable[str],
+        policy: Optional["RefreshPolicy"] = None,
+    ) -> "RefreshScheduler":
+        """
+        Keep local copies of organizations' registries fresh in the background.
+
+        Each registry is polled at an interval that adapts to how often it
+        changes, within the bounds of ``policy``.
+        The scheduler runs on background threads and stops when the client
+        is closed.
+
+        Parameters
+        ----------
+        organization_urls : iterable of str
+            Base URLs of the organizations to watch. Calling this again
+            adds more organizations to the same scheduler.
+
+        policy : RefreshPolicy, optional
+            Polling bounds and concurrency. Only used by the first call.
+
+        Returns
+        -------
+        RefreshScheduler
+            Use ``snapshot(url)`` for the latest copy of a registry and
+            ``status()`` for next refresh times and refresh lag.
+        """
+        if self._scheduler is None:
+            # Imported here so that the scheduler (and asyncio) only load
+            # once registries are watched.
+            from .scheduler import RefreshScheduler
+
+            self._scheduler = RefreshScheduler(self._fetch_registry_snapshot, policy)
+            self._scheduler.start()
+        for organization_url in organization_urls:
+            self._scheduler.add(organization_url)
+        return self._scheduler
+
+    def _fetch_registry_snapshot(
+        self, organization_url: str
+    ) -> "RegistrySnapshot":
+        from .scheduler import RegistrySnapshot
+
+        entries = self.iter_registry(organization_url)
+        return RegistrySnapshot.from_entries(organization_url, entries)
+
     def search(
         self,
         query: str,
@@ -60,6 +214,7 @@ class AgentSearchClient:
         default_input_mode: Optional[List[InputMode]] = None,
         default_output_mode: Optional[List[OutputMode]] = None,
         allowed_url: Optional[List[str]] = None,
+        timeout_budget: Optional[float] = None,
     ) -> SearchResponse:
         """
         Discover agents that can best handle a given query.
@@ -97,6 +252,12 @@ class AgentSearchClient:
         allowed_url : list of str, optional
             If set, these URLs are used as the discovered organizations.
 
+        timeout_budget : float, optional
+            Total time in seconds the call may take, including retries.
+            Each attempt only gets the budget that is left, and the call
+            raises ``TimeoutError`` once it runs out. A deadline set with
+            ``deadline_scope()`` applies as well; the earliest one wins.
+
         Returns
         -------
         SearchResponse
@@ -114,19 +275,166 @@ class AgentSearchClient:
             allowed_url=allowed_url,
         )
 
-        raw = self._transport.post_json(
-            "/v1/agents/search", request.model_dump(exclude_none=True)
+        return self._execute(request, timeout_budget)
+
+    def prepare(
+        self,
+        *,
+        max_result: Optional[int] = None,
+        country: Optional[str] = None,
+        capability: Optional[Literal["streaming", "push_notification"]] = None,
+        default_input_mode: Optional[List[InputMode]] = None,
+        default_output_mode: Optional[List[OutputMode]] = None,
+        allowed_url: Optional[List[str]] = None,
+    ) -> PreparedSearch:
+        """
+        Validate and encode a set of filters once for repeated searches.
+
+        Accepts the same filters as ``search()``. The returned callable
+        takes ``query`` and optionally ``max_result`` and ``timeout_budget``,
+        and skips request validation and filter serialization on each call.
+
+        Example
+        -------
+        >>> search_acme = client.prepare(country="KE", allowed_url=urls)
+        >>> response = search_acme("Convert USD to KES")
+        """
+
+        template = SearchTemplate(
+            max_result=max_result,
+            country=country,
+            capability=capability,
+            default_input_mode=default_input_mode,
+            default_output_mode=default_output_mode,
+            allowed_url=allowed_url,
         )
+        return PreparedSearch(template, self._search_prepared)
 
-        agents = [AgentDetails(**agent) for agent in raw.get("data", [])]
+    def warm(
+        self,
+        source: "WarmupSource",
+        *,
+        top_n: int = 100,
+        concurrency: int = 4,
+        rate: Optional[float] = 10.0,
+        deadline: Optional[float] = None,
+        progress: Optional[Callable[["WarmupReport"], None]] = None,
+    ) -> "WarmupReport":
+        """
+        Pre-populate the cache from a log of past searches.
 
-        return SearchResponse(
-            success=True,
-            agents=agents,
-            message=raw.get("message"),
-            error=None if raw.get("success") else raw.get("error"),
+        Picks the ``top_n`` most frequent distinct requests from ``source``
+        and runs them through the client. This fills the response cache (if
+        the client has one) and opens pooled connections. Bounded
+        concurrency and a rate cap keep warm-up from starving live traffic.
+
+        Parameters
+        ----------
+        source : str, Path or iterable
+            JSONL file (or iterable of JSON lines or dicts) of
+            ``SearchRequest`` records. An optional ``count`` field weights
+            a record, so frequency-ranked lists work too.
+
+        top_n : int, default=100
+            Number of distinct requests to warm.
+
+        concurrency : int, default=4
+            Maximum number of warm-up requests in flight.
+
+        rate : float, default=10.0
+            Maximum warm-up requests started per second. ``None`` disables
+            the cap.
+
+        deadline : float, optional
+            Stop warming after this many seconds.
+
+        progress : callable, optional
+            Called with the ``WarmupReport`` after each request.
+
+        Returns
+        -------
+        WarmupReport
+            How much of the hot set was warmed, and whether warm-up
+            finished before the deadline.
+        """
+
+        from .warmup import WarmupReport, load_hot_set, run_warmup
+
+        requests, skipped = load_hot_set(source, top_n)
+        report = WarmupReport(total=len(requests), skipped=skipped)
+        return run_warmup(
+            self._execute,
+            requests,
+            report,
+            concurrency=concurrency,
+            rate=rate,
+            deadline=deadline,
+            progress=progress,
         )
 
+    def _search_prepared(
+        self,
+        template: SearchTemplate,
+        query: str,
+        max_result: Optional[int],
+        timeout_budget: Optional[float],
+    ) -> SearchResponse:
+        content = template.encode(query, max_result)
+        if self._cache is None and self._sharding is None:
+            raw = self._transport.post_encoded(
+                SEARCH_PATH, content, deadline=resolve_deadline(timeout_budget)
+            )
+            return _build_response(raw)
+
+        request = template.to_request(query, max_result)
+        return self._execute(request, timeout_budget, content)
+
+    def _execute(
+        self,
+        request: SearchRequest,
+        timeout_budget: Optional[float],
+        content: Optional[bytes] = None,
+    ) -> SearchResponse:
+        if self._cache is not None:
+            cached = self._cache.lookup(request)
+            if cached is not None:
+                return _build_response(cached, served_locally=True)
+
+        deadline = resolve_deadline(timeout_budget)
+        shards = self._sharding.split(request) if self._sharding else None
+        if shards is not None:
+            results = self._fetch_shards(shards, deadline)
+            raw = merge_shard_results(
+                shards, results, request.max_result, self._sharding.on_error
+            )
+        elif content is not None:
+            raw = self._transport.post_encoded(SEARCH_PATH, content, deadline)
+        else:
+            raw = self._transport.post_json(
+                SEARCH_PATH, request.model_dump(exclude_none=True), deadline
+            )
+
+        if self._cache is not None:
+            self._cache.store(request, raw)
+        return _build_response(raw)
+
+    def _fetch_shards(
+        self, shards: List[SearchRequest], deadline: Optional[Deadline]
+    ) -> List[Union[Dict[str, Any], SdkError]]:
+        def fetch(shard: SearchRequest) -> Union[Dict[str, Any], SdkError]:
+            try:
+                return self._transport.post_json(
+                    SEARCH_PATH, shard.model_dump(exclude_none=True), deadline
+                )
+            except SdkError as e:
+                return e
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        workers = min(len(shards), self._sharding.max_concurrency)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(fetch, shards))
+
 
 class AsyncAgentSearchClient:
     """
@@ -146,12 +454,22 @@ class AsyncAgentSearchClient:
         API key for authenticating requests. If not provided, the client will
         attempt to read from the PAYELINK_KEY environment variable.
         The API key is sent as a Bearer token in the Authorization header.
+
+    cache : ResponseCache, optional
+        Cache for search results. When set, repeated searches and narrower
+        variants of cached searches are answered without a round trip.
+
+    sharding : ShardPolicy, optional
+        Split searches with long ``allowed_url`` lists into concurrent
+        shard requests and merge their results.
     """
 
     def __init__(
         self,
         retries: int = 2,
         api_key: Optional[str] = None,
+        cache: Optional[ResponseCache] = None,
+        sharding: Optional[ShardPolicy] = None,
     ):
         # Use provided API key or fall back to environment variable
         resolved_api_key = api_key or os.getenv("PAYELINK_KEY")
@@ -160,10 +478,19 @@ class AsyncAgentSearchClient:
             retries=retries,
             api_key=resolved_api_key,
         )
+        self._cache = cache
+        self._sharding = sharding
+        self._scheduler: Optional["AsyncRefreshScheduler"] = None
+
+        # Imported here so that the async stack is only loaded when used.
+        from .transport import AsyncTransport
 
         self._transport = AsyncTransport(self._config)
 
     async def close(self) -> None:
+        if self._scheduler is not None:
+            await self._scheduler.stop()
+            self._scheduler = None
         await self._transport.close()
 
     async def __aenter__(self) -> "AsyncAgentSearchClient":
@@ -172,6 +499,91 @@ class AsyncAgentSearchClient:
     async def __aexit__(self, exc_type, exc, tb) -> None:
         await self.close()
 
+    def iter_registry(
+        self,
+        organization_url: str,
+        *,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_agents: int = DEFAULT_MAX_AGENTS,
+    ) -> AsyncIterator[RegistryEntry]:
+        """
+        Stream an organization's ``/.well-known/agents.json`` registry.
+
+        Entries are yielded while the registry is still downloading: first
+        the ``RegistryOrganization``, then one ``RegistryAgent`` per
+        ``agents[]`` entry. You can start fetching agent cards before the
+        download completes. Memory use is bounded by the size of one entry.
+
+        Parameters
+        ----------
+        organization_url : str
+            Base URL of the organization, e.g. "https://acme.com".
+
+        max_bytes : int, default=5 MiB
+            Maximum size of the registry document.
+
+        max_agents : int, default=10000
+            Maximum number of agents in the registry.
+
+        Raises
+        ------
+        LimitExceededError
+            If the registry exceeds ``max_bytes`` or ``max_agents``.
+
+        InvalidResponseError
+            If the registry is not a valid ``agents.json`` document.
+        """
+
+        chunks = self._transport.stream_bytes(registry_url(organization_url))
+        return aiter_registry(chunks, max_bytes=max_bytes, max_agents=max_agents)
+
+    def watch_registries(
+        self,
+        organization_urls: Iterable[str],
+        policy: Optional["RefreshPolicy"] = None,
+    ) -> "AsyncRefreshScheduler":
+        """
+        Keep local copies of organizations' registries fresh in the background.
+
+        Each registry is polled at an interval that adapts to how often it
+        changes, within the bounds of ``policy``.
+        Must be called from a running event loop. The scheduler stops when
+        the client is closed.
+
+        Parameters
+        ----------
+        organization_urls : iterable of str
+            Base URLs of the organizations to watch. Calling this again
+            adds more organizations to the same scheduler.
+
+        policy : RefreshPolicy, optional
+            Polling bounds and concurrency. Only used by the first call.
+
+        Returns
+        -------
+        AsyncRefreshScheduler
+            Use ``snapshot(url)`` for the latest copy of a registry and
+            ``status()`` for next refresh times and refresh lag.
+        """
+        if self._scheduler is None:
+            from .scheduler import AsyncRefreshScheduler
+
+            self._scheduler = AsyncRefreshScheduler(
+                self._fetch_registry_snapshot, policy
+            )
+            self._scheduler.start()
+        for organization_url in organization_urls:
+            self._scheduler.add(organization_url)
+        return self._scheduler
+
+    async def _fetch_registry_snapshot(
+        self, organization_url: str
+    ) -> "RegistrySnapshot":
+        from .scheduler import RegistrySnapshot
+
+        entries = [entry async for entry in self.iter_registry(organization_url)]
+        return RegistrySnapshot.from_entries(organization_url, entries)
+
     async def search(
         self,
         query: str,
@@ -182,6 +594,7 @@ class AsyncAgentSearchClient:
         default_input_mode: Optional[List[InputMode]] = None,
         default_output_mode: Optional[List[OutputMode]] = None,
         allowed_url: Optional[List[str]] = None,
+        timeout_budget: Optional[float] = None,
     ) -> SearchResponse:
         """
         Discover agents that can best handle a given query.
@@ -219,6 +632,12 @@ class AsyncAgentSearchClient:
         allowed_url : list of str, optional
             If set, these URLs are used as the discovered organizations.
 
+        timeout_budget : float, optional
+            Total time in seconds the call may take, including retries.
+            Each attempt only gets the budget that is left, and the call
+            raises ``TimeoutError`` once it runs out. A deadline set with
+            ``deadline_scope()`` applies as well; the earliest one wins.
+
         Returns
         -------
         SearchResponse
@@ -236,15 +655,164 @@ class AsyncAgentSearchClient:
             allowed_url=allowed_url,
         )
 
-        raw = await self._transport.post_json(
-            "/v1/agents/search", request.model_dump(exclude_none=True)
+        return await self._execute(request, timeout_budget)
+
+    def prepare(
+        self,
+        *,
+        max_result: Optional[int] = None,
+        country: Optional[str] = None,
+        capability: Optional[Literal["streaming", "push_notification"]] = None,
+        default_input_mode: Optional[List[InputMode]] = None,
+        default_output_mode: Optional[List[OutputMode]] = None,
+        allowed_url: Optional[List[str]] = None,
+    ) -> AsyncPreparedSearch:
+        """
+        Validate and encode a set of filters once for repeated searches.
+
+        Accepts the same filters as ``search()``. The returned callable
+        takes ``query`` and optionally ``max_result`` and ``timeout_budget``,
+        and skips request validation and filter serialization on each call.
+
+        Example
+        -------
+        >>> search_acme = client.prepare(country="KE", allowed_url=urls)
+        >>> response = search_acme("Convert USD to KES")
+        """
+
+        template = SearchTemplate(
+            max_result=max_result,
+            country=country,
+            capability=capability,
+            default_input_mode=default_input_mode,
+            default_output_mode=default_output_mode,
+            allowed_url=allowed_url,
         )
+        return AsyncPreparedSearch(template, self._search_prepared)
 
-        agents = [AgentDetails(**agent) for agent in raw.get("data", [])]
+    async def warm(
+        self,
+        source: "WarmupSource",
+        *,
+        top_n: int = 100,
+        concurrency: int = 4,
+        rate: Optional[float] = 10.0,
+        deadline: Optional[float] = None,
+        progress: Optional[Callable[["WarmupReport"], None]] = None,
+    ) -> "WarmupReport":
+        """
+        Pre-populate the cache from a log of past searches.
 
-        return SearchResponse(
-            success=True,
-            agents=agents,
-            message=raw.get("message"),
-            error=None if raw.get("success") else raw.get("error"),
+        Picks the ``top_n`` most frequent distinct requests from ``source``
+        and runs them through the client. This fills the response cache (if
+        the client has one) and opens pooled connections. Bounded
+        concurrency and a rate cap keep warm-up from starving live traffic.
+
+        Parameters
+        ----------
+        source : str, Path or iterable
+            JSONL file (or iterable of JSON lines or dicts) of
+            ``SearchRequest`` records. An optional ``count`` field weights
+            a record, so frequency-ranked lists work too.
+
+        top_n : int, default=100
+            Number of distinct requests to warm.
+
+        concurrency : int, default=4
+            Maximum number of warm-up requests in flight.
+
+        rate : float, default=10.0
+            Maximum warm-up requests started per second. ``None`` disables
+            the cap.
+
+        deadline : float, optional
+            Stop warming after this many seconds.
+
+        progress : callable, optional
+            Called with the ``WarmupReport`` after each request.
+
+        Returns
+        -------
+        WarmupReport
+            How much of the hot set was warmed, and whether warm-up
+            finished before the deadline.
+        """
+
+        from .warmup import WarmupReport, arun_warmup, load_hot_set
+
+        requests, skipped = load_hot_set(source, top_n)
+        report = WarmupReport(total=len(requests), skipped=skipped)
+        return await arun_warmup(
+            self._execute,
+            requests,
+            report,
+            concurrency=concurrency,
+            rate=rate,
+            deadline=deadline,
+            progress=progress,
         )
+
+    async def _search_prepared(
+        self,
+        template: SearchTemplate,
+        query: str,
+        max_result: Optional[int],
+        timeout_budget: Optional[float],
+    ) -> SearchResponse:
+        content = template.encode(query, max_result)
+        if self._cache is None and self._sharding is None:
+            raw = await self._transport.post_encoded(
+                SEARCH_PATH, content, deadline=resolve_deadline(timeout_budget)
+            )
+            return _build_response(raw)
+
+        request = template.to_request(query, max_result)
+        return await self._execute(request, timeout_budget, content)
+
+    async def _execute(
+        self,
+        request: SearchRequest,
+        timeout_budget: Optional[float],
+        content: Optional[bytes] = None,
+    ) -> SearchResponse:
+        if self._cache is not None:
+            cached = self._cache.lookup(request)
+            if cached is not None:
+                return _build_response(cached, served_locally=True)
+
+        deadline = resolve_deadline(timeout_budget)
+        shards = self._sharding.split(request) if self._sharding else None
+        if shards is not None:
+            results = await self._fetch_shards(shards, deadline)
+            raw = merge_shard_results(
+                shards, results, request.max_result, self._sharding.on_error
+            )
+        elif content is not None:
+            raw = await self._transport.post_encoded(SEARCH_PATH, content, deadline)
+        else:
+            raw = await self._transport.post_json(
+                SEARCH_PATH, request.model_dump(exclude_none=True), deadline
+            )
+
+        if self._cache is not None:
+            self._cache.store(request, raw)
+        return _build_response(raw)
+
+    async def _fetch_shards(
+        self, shards: List[SearchRequest], deadline: Optional[Deadline]
+    ) -> List[Union[Dict[str, Any], SdkError]]:
+        # Imported here so that sync-only code never loads asyncio.
+        import asyncio
+
+        semaphore = asyncio.Semaphore(self._sharding.max_concurrency)
+
+        async def fetch(shard: SearchRequest) -> Union[Dict[str, Any], SdkError]:
+            async with semaphore:
+                try:
+                    return await self._transport.post_json(
+                        SEARCH_PATH, shard.model_dump(exclude_none=True), deadline
+                    )
+                except SdkError as e:
+                    return e
+
+        return list(await asyncio.gather(*(fetch(shard) for shard in shards)))
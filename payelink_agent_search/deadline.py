@@ -0,0 +1,77 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+_current_deadline: ContextVar[Optional["Deadline"]] = ContextVar(
+    "payelink_agent_search_deadline", default=None
+)
+
+
+@dataclass(frozen=True)
+class Deadline:
+    """
+    Absolute point in time by which a call must complete.
+
+    Deadlines are measured on the monotonic clock so that they are not
+    affected by wall-clock adjustments.
+    """
+
+    expires_at: float
+
+    @classmethod
+    def after(cls, seconds: float) -> "Deadline":
+        return cls(expires_at=time.monotonic() + seconds)
+
+    def remaining(self) -> float:
+        """Seconds left before the deadline, never negative."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def earliest(self, other: Optional["Deadline"]) -> "Deadline":
+        if other is None or self.expires_at <= other.expires_at:
+            return self
+        return other
+
+
+def current_deadline() -> Optional[Deadline]:
+    """Return the deadline inherited from the current context, if any."""
+    return _current_deadline.get()
+
+
+def resolve_deadline(timeout_budget: Optional[float] = None) -> Optional[Deadline]:
+    """
+    Combine a per-call budget with the deadline of the current context.
+
+    The earliest of the two wins, so a nested call can tighten but never
+    extend the budget of its caller.
+    """
+    inherited = current_deadline()
+    if timeout_budget is None:
+        return inherited
+    return Deadline.after(timeout_budget).earliest(inherited)
+
+
+@contextmanager
+def deadline_scope(timeout_budget: float) -> Iterator[Deadline]:
+    """
+    Run a block of code under a total time budget.
+
+    Every ``search()`` issued inside the block, including from nested
+    helpers and from tasks created inside it, inherits the deadline.
+
+    Example
+    -------
+    >>> with deadline_scope(0.5):
+    ...     client.search("Convert USD to KES")
+    """
+    deadline = resolve_deadline(timeout_budget)
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
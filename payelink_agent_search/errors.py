@@ -21,3 +21,9 @@ class NetworkError(SdkError):
 
 class InvalidResponseError(SdkError):
     pass
+
+class LimitExceededError(SdkError):
+    pass
+
+class CatalogError(SdkError):
+    pass
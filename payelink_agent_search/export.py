@@ -0,0 +1,348 @@
+import csv
+import gzip
+import io
+import json
+import os
+from typing import (
+    IO,
+    Any,
+    AsyncIterable,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from .models import SearchRequest, SearchResponse
+
+# Columns of an exported row. ``metadata`` holds the instrumentation data
+# other than ``latency_ms`` as a JSON object.
+COLUMNS = (
+    "query",
+    "success",
+    "error",
+    "served_locally",
+    "latency_ms",
+    "rank",
+    "agent_id",
+    "agent_name",
+    "agent_description",
+    "agent_url",
+    "organization_name",
+    "organization_url",
+    "metadata",
+)
+
+FORMATS = ("ndjson", "csv", "arrow", "parquet")
+
+DEFAULT_BATCH_SIZE = 1000
+
+_SUFFIXES = {
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+    ".csv": "csv",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+    ".parquet": "parquet",
+}
+
+ExportRecord = Union[
+    Tuple[SearchRequest, SearchResponse],
+    Tuple[SearchRequest, SearchResponse, Optional[Mapping[str, Any]]],
+]
+ExportTarget = Union[str, "os.PathLike[str]", IO[bytes]]
+Row = Tuple[Any, ...]
+
+
+def flatten(
+    request: SearchRequest,
+    response: SearchResponse,
+    metadata: Optional[Mapping[str, Any]] = None,
+) -> List[Row]:
+    """
+    Rows for one search, one per returned agent, in ``COLUMNS`` order.
+
+    A search without agents (including a failed one) gives a single row
+    with empty agent columns, so every query is represented.
+    """
+    extra = dict(metadata or {})
+    latency = extra.pop("latency_ms", None)
+    head = (
+        request.query,
+        response.success,
+        response.error,
+        response.served_locally,
+        latency,
+    )
+    tail = (json.dumps(extra, ensure_ascii=False, default=str) if extra else None,)
+
+    if not response.agents:
+        return [head + (None,) * 7 + tail]
+    # Attribute access avoids building a dict per agent with model_dump().
+    return [
+        head
+        + (
+            rank,
+            agent.agent_id,
+            agent.agent_name,
+            agent.agent_description,
+            agent.agent_url,
+            agent.organization_name,
+            agent.organization_url,
+        )
+        + tail
+        for rank, agent in enumerate(response.agents, start=1)
+    ]
+
+
+def _resolve_format(
+    target: ExportTarget, format: Optional[str], compression: Optional[str]
+) -> Tuple[str, Optional[str]]:
+    name = "" if hasattr(target, "write") else os.fspath(target).lower()
+    gzipped = name.endswith(".gz")
+    if gzipped:
+        name = name[:-3]
+    if format is None:
+        format = _SUFFIXES.get(os.path.splitext(name)[1])
+        if format is None:
+            raise ValueError(
+                "Cannot infer the export format; pass format= "
+                f"(one of {', '.join(FORMATS)})"
+            )
+    if format not in FORMATS:
+        raise ValueError(f"Unknown export format {format!r}")
+    if gzipped:
+        # Arrow and Parquet compress inside the file, so a .gz name would
+        # not describe what is written.
+        if format not in ("ndjson", "csv"):
+            raise ValueError(
+                "A .gz suffix is only supported for ndjson and csv exports; "
+                f"pass compression= to compress {format} files"
+            )
+        compression = compression or "gzip"
+    if format in ("ndjson", "csv") and compression not in (None, "gzip"):
+        raise ValueError(f"{format} exports only support gzip compression")
+    return format, compression
+
+
+def _open_binary(
+    target: ExportTarget, compression: Optional[str]
+) -> Tuple[IO[bytes], List[IO[Any]]]:
+    """The stream to write to, and the streams to close afterwards."""
+    owned: List[IO[Any]] = []
+    if hasattr(target, "write"):
+        stream = target
+    else:
+        stream = open(target, "wb")
+        owned.append(stream)
+    if compression == "gzip":
+        stream = gzip.GzipFile(fileobj=stream, mode="wb")
+        owned.insert(0, stream)
+    return stream, owned
+
+
+class _TextWriter:
+    def __init__(
+        self, target: ExportTarget, format: str, compression: Optional[str]
+    ) -> None:
+        binary, self._owned = _open_binary(target, compression)
+        self._text = io.TextIOWrapper(binary, encoding="utf-8", newline="")
+        self._format = format
+        if format == "csv":
+            self._csv = csv.writer(self._text)
+            self._csv.writerow(COLUMNS)
+
+    def write(self, rows: List[Row]) -> None:
+        if self._format == "csv":
+            self._csv.writerows(rows)
+            return
+        self._text.write(
+            "".join(
+                json.dumps(dict(zip(COLUMNS, row)), ensure_ascii=False) + "\n"
+                for row in rows
+            )
+        )
+
+    def close(self) -> None:
+        self._text.flush()
+        # Closing the wrapper would close a caller's file as well.
+        self._text.detach()
+        for stream in self._owned:
+            stream.close()
+
+
+class _ArrowWriter:
+    def __init__(
+        self, target: ExportTarget, format: str, compression: Optional[str]
+    ) -> None:
+        try:
+            import pyarrow as pa
+        except ImportError as e:
+            raise ImportError(
+                f"Exporting to {format} requires pyarrow: pip install pyarrow"
+            ) from e
+
+        self._pa = pa
+        self._schema = pa.schema(
+            [
+                ("query", pa.string()),
+                ("success", pa.bool_()),
+                ("error", pa.string()),
+                ("served_locally", pa.bool_()),
+                ("latency_ms", pa.float64()),
+                ("rank", pa.int32()),
+                ("agent_id", pa.string()),
+                ("agent_name", pa.string()),
+                ("agent_description", pa.string()),
+                ("agent_url", pa.string()),
+                ("organization_name", pa.string()),
+                ("organization_url", pa.string()),
+                ("metadata", pa.string()),
+            ]
+        )
+        sink = target if hasattr(target, "write") else os.fspath(target)
+        if format == "parquet":
+            import pyarrow.parquet as pq
+
+            self._writer = pq.ParquetWriter(
+                sink, self._schema, compression=compression or "snappy"
+            )
+        else:
+            options = pa.ipc.IpcWriteOptions(compression=compression)
+            self._writer = pa.ipc.new_file(sink, self._schema, options=options)
+
+    def write(self, rows: List[Row]) -> None:
+        columns = list(zip(*rows))
+        batch = self._pa.RecordBatch.from_arrays(
+            [
+                self._pa.array(column, type=field.type)
+                for column, field in zip(columns, self._schema)
+            ],
+            schema=self._schema,
+        )
+        self._writer.write_batch(batch)
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+class ResultExporter:
+    """
+    Writes search results to a file in fixed-size batches.
+
+    Rows are buffered until ``batch_size`` of them are ready and then
+    written, so memory use does not grow with the number of searches.
+    See ``export_results()`` for the formats and options.
+    """
+
+    def __init__(
+        self,
+        target: ExportTarget,
+        format: Optional[str] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        compression: Optional[str] = None,
+    ) -> None:
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.format, compression = _resolve_format(target, format, compression)
+        self.batch_size = batch_size
+        self.rows_written = 0
+        self._rows: List[Row] = []
+        if self.format in ("arrow", "parquet"):
+            self._writer: Any = _ArrowWriter(target, self.format, compression)
+        else:
+            self._writer = _TextWriter(target, self.format, compression)
+
+    def __enter__(self) -> "ResultExporter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def add(
+        self,
+        request: SearchRequest,
+        response: SearchResponse,
+        metadata: Optional[Mapping[str, Any]] = None,
+    ) -> None:
+        self._rows.extend(flatten(request, response, metadata))
+        while len(self._rows) >= self.batch_size:
+            self._flush(self._rows[: self.batch_size])
+            del self._rows[: self.batch_size]
+
+    def close(self) -> None:
+        """Write the remaining rows and close the file."""
+        if self._writer is None:
+            return
+        if self._rows:
+            self._flush(self._rows)
+            self._rows = []
+        self._writer.close()
+        self._writer = None
+
+    def _flush(self, rows: List[Row]) -> None:
+        self._writer.write(rows)
+        self.rows_written += len(rows)
+
+
+def export_results(
+    records: Iterable[ExportRecord],
+    target: ExportTarget,
+    format: Optional[str] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    compression: Optional[str] = None,
+) -> int:
+    """
+    Stream ``(request, response[, metadata])`` records to a file.
+
+    Each returned agent becomes one row with the ``AgentDetails`` fields,
+    the originating query and its rank. ``metadata`` is an optional
+    mapping of instrumentation data: ``latency_ms`` gets its own column
+    and any other keys are stored as a JSON object in ``metadata``.
+
+    Parameters
+    ----------
+    records : iterable of tuples
+        ``(SearchRequest, SearchResponse)`` pairs, optionally with a
+        metadata mapping as a third item.
+
+    target : str, path or binary file
+        Where to write. NDJSON and CSV paths ending in ``.gz`` are
+        gzip-compressed.
+
+    format : {"ndjson", "csv", "arrow", "parquet"}, optional
+        Output format. Inferred from the file suffix when omitted. Arrow
+        IPC and Parquet require ``pyarrow``.
+
+    batch_size : int, default=1000
+        Number of rows written at a time.
+
+    compression : str, optional
+        ``"gzip"`` for NDJSON and CSV. For Arrow and Parquet, any codec
+        pyarrow supports for the format (e.g. ``"zstd"``).
+
+    Returns
+    -------
+    int
+        The number of rows written.
+    """
+    with ResultExporter(target, format, batch_size, compression) as exporter:
+        for record in records:
+            exporter.add(*record)
+    return exporter.rows_written
+
+
+async def aexport_results(
+    records: AsyncIterable[ExportRecord],
+    target: ExportTarget,
+    format: Optional[str] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    compression: Optional[str] = None,
+) -> int:
+    """Async variant of ``export_results()`` for async record streams."""
+    with ResultExporter(target, format, batch_size, compression) as exporter:
+        async for record in records:
+            exporter.add(*record)
+    return exporter.rows_written
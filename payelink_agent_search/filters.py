@@ -0,0 +1,192 @@
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .models import SearchRequest
+
+# Keys under which agent metadata may appear in raw search results.
+_COUNTRY_KEYS = ("country", "organization_country")
+_CAPABILITY_KEYS = ("capabilities",)
+_INPUT_MODE_KEYS = ("default_input_modes", "defaultInputModes", "default_input_mode")
+_OUTPUT_MODE_KEYS = (
+    "default_output_modes",
+    "defaultOutputModes",
+    "default_output_mode",
+)
+
+# Filters the engine knows how to evaluate locally.
+_LOCAL_FILTERS = ("country", "capability", "default_input_mode", "default_output_mode")
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.split())
+
+
+def _same_values(left: Optional[Sequence[str]], right: Optional[Sequence[str]]) -> bool:
+    if left is None or right is None:
+        return left is right
+    return set(left) == set(right)
+
+
+def _lookup(agent: Dict[str, Any], keys: Iterable[str]) -> Any:
+    for key in keys:
+        if agent.get(key) is not None:
+            return agent[key]
+    return None
+
+
+def _is_alpha2(country: str) -> bool:
+    return len(country) == 2 and country.isascii() and country.isalpha()
+
+
+def _match_country(agent: Dict[str, Any], country: str) -> Optional[bool]:
+    value = _lookup(agent, _COUNTRY_KEYS)
+    if not isinstance(value, str):
+        return None
+    if value.casefold() == country.casefold():
+        return True
+    # Only two ISO alpha-2 codes are known to name different countries;
+    # "USA" and "United States", or "KE" and "Kenya", may name the same one.
+    if _is_alpha2(value) and _is_alpha2(country):
+        return False
+    return None
+
+
+def _match_capability(agent: Dict[str, Any], capability: str) -> Optional[bool]:
+    value = _lookup(agent, _CAPABILITY_KEYS)
+    if isinstance(value, dict):
+        return bool(value.get(capability, False))
+    if isinstance(value, (list, tuple)):
+        return capability in value
+    return None
+
+
+def _match_modes(
+    agent: Dict[str, Any], keys: Tuple[str, ...], modes: Sequence[str]
+) -> Optional[bool]:
+    value = _lookup(agent, keys)
+    if isinstance(value, str):
+        value = [value]
+    if not isinstance(value, (list, tuple)):
+        return None
+    supported = [mode in value for mode in modes]
+    if all(supported):
+        return True
+    if not any(supported):
+        return False
+    # Partial overlap: the answer depends on whether the API requires all
+    # or any of the requested modes, so leave it to the server.
+    return None
+
+
+class FilterEngine:
+    """
+    Evaluates search filters locally over cached agent metadata.
+
+    A narrower search can be answered from a cached result when:
+
+    - both requests share the query, ``allowed_url`` and ``search_depth``,
+    - every filter of the cached request is also set on the new request,
+    - the new filters can be decided from the cached agents' metadata, and
+    - the cached result either holds at least ``max_result`` matching
+      agents or was not truncated by its own ``max_result``.
+
+    A request without ``max_result`` gets the API's default limit, so it
+    is only answered from a cached result of the same unbounded search.
+
+    The API returns agents ranked by relevance to the query, so the first
+    ``max_result`` matching agents in cached order are the narrower result.
+    """
+
+    def answer(
+        self,
+        cached_request: SearchRequest,
+        cached_data: Sequence[Dict[str, Any]],
+        request: SearchRequest,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Return the agents for ``request``, or None if it needs a round trip.
+        """
+        extra = self._extra_filters(cached_request, request)
+        if extra is None:
+            return None
+
+        limit = request.max_result
+        if limit is None:
+            # The API applies its own default limit, so only an unbounded
+            # cached result of the same search is known to match it.
+            if cached_request.max_result is None and not extra:
+                return list(cached_data)
+            return None
+
+        # A result sent without max_result may have been cut at the API's
+        # default limit, so it is never known to be complete.
+        exhaustive = (
+            cached_request.max_result is not None
+            and len(cached_data) < cached_request.max_result
+        )
+
+        matches: List[Dict[str, Any]] = []
+        for agent in cached_data:
+            if len(matches) == limit:
+                return matches
+            matched = self.matches(agent, request, extra)
+            if matched is None:
+                return None
+            if matched:
+                matches.append(agent)
+
+        if len(matches) == limit or exhaustive:
+            return matches
+        return None
+
+    def matches(
+        self,
+        agent: Dict[str, Any],
+        request: SearchRequest,
+        filters: Iterable[str] = _LOCAL_FILTERS,
+    ) -> Optional[bool]:
+        """
+        Whether ``agent`` satisfies the given filters of ``request``.
+
+        Returns None when the agent's metadata cannot decide it.
+        """
+        for name in filters:
+            value = getattr(request, name)
+            if value is None:
+                continue
+            if name == "country":
+                matched = _match_country(agent, value)
+            elif name == "capability":
+                matched = _match_capability(agent, value)
+            elif name == "default_input_mode":
+                matched = _match_modes(agent, _INPUT_MODE_KEYS, value)
+            else:
+                matched = _match_modes(agent, _OUTPUT_MODE_KEYS, value)
+            if matched is not True:
+                return matched
+        return True
+
+    @staticmethod
+    def _extra_filters(
+        cached: SearchRequest, request: SearchRequest
+    ) -> Optional[List[str]]:
+        """Filters set on ``request`` only, or None if not a narrowing."""
+        if normalize_query(cached.query) != normalize_query(request.query):
+            return None
+        if cached.search_depth != request.search_depth:
+            return None
+        if not _same_values(cached.allowed_url, request.allowed_url):
+            return None
+
+        extra = []
+        for name in _LOCAL_FILTERS:
+            cached_value = getattr(cached, name)
+            value = getattr(request, name)
+            if cached_value is None:
+                if value is not None:
+                    extra.append(name)
+            elif isinstance(cached_value, list):
+                if not _same_values(cached_value, value):
+                    return None
+            elif cached_value != value:
+                return None
+        return extra
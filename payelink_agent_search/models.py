@@ -1,6 +1,6 @@
 from typing import List, Literal, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 InputMode = Literal[
     "text/plain",
@@ -15,6 +15,9 @@ OutputMode = Literal[
 ]
 
 class SearchRequest(BaseModel):
+    # Validators are built on first use rather than at import time.
+    model_config = ConfigDict(defer_build=True)
+
     query: str = Field(..., description="The query to search for")
     max_result: Optional[int] = Field(
         10, description="The max number of agents to return"
@@ -31,6 +34,8 @@ class SearchRequest(BaseModel):
 
 
 class AgentDetails(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     agent_id: Optional[str] = Field(None, description="The unique identifier of the agent")
     agent_name: Optional[str] = Field(None, description="The name of the agent")
     agent_description: Optional[str] = Field(None, description="The description of the agent")
@@ -38,9 +43,38 @@ class AgentDetails(BaseModel):
     organization_name: Optional[str] = Field(None, description="The name of the organization")
     organization_url: Optional[str] = Field(None, description="The URL of the organization")
 
+class ShardError(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
+    shard: int = Field(..., description="Index of the failed shard")
+    allowed_url: List[str] = Field(
+        default_factory=list, description="The URLs searched by the shard"
+    )
+    error: str = Field(..., description="Why the shard failed")
+
 class SearchResponse(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     success: bool = Field(..., description="Whether the request succeeded")
     agents: List[AgentDetails] = Field(default_factory=list)
     message: Optional[str] = Field(None, description="Optional message from the API (e.g. 'Found N agent(s)')")
     error: Optional[str] = None
+    served_locally: bool = Field(
+        False, description="Whether the response was served from the client-side cache"
+    )
+    shard_errors: List[ShardError] = Field(
+        default_factory=list, description="Failed shards of a partial sharded search"
+    )
+
+
+class RegistryOrganization(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
+    name: Optional[str] = Field(None, description="The name of the organization")
+    url: Optional[str] = Field(None, description="The URL of the organization")
+
+class RegistryAgent(BaseModel):
+    model_config = ConfigDict(defer_build=True)
 
+    id: str = Field(..., description="The identifier of the agent within the registry")
+    card: str = Field(..., description="The URL of the agent's card")
@@ -0,0 +1,125 @@
+import json
+from typing import Awaitable, Callable, List, Literal, Optional
+
+from .models import InputMode, OutputMode, SearchRequest, SearchResponse
+
+
+def _encode(value: object) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+class SearchTemplate:
+    """
+    Search filters that are validated and JSON-encoded once.
+
+    Only ``query`` and ``max_result`` vary between calls; they are spliced
+    into the pre-encoded body without building a ``SearchRequest``.
+    """
+
+    __slots__ = ("_filters", "_max_result", "_suffix")
+
+    def __init__(
+        self,
+        *,
+        max_result: Optional[int] = None,
+        country: Optional[str] = None,
+        capability: Optional[Literal["streaming", "push_notification"]] = None,
+        default_input_mode: Optional[List[InputMode]] = None,
+        default_output_mode: Optional[List[OutputMode]] = None,
+        allowed_url: Optional[List[str]] = None,
+    ) -> None:
+        request = SearchRequest(
+            query="",
+            max_result=max_result,
+            country=country,
+            capability=capability,
+            default_input_mode=default_input_mode,
+            default_output_mode=default_output_mode,
+            allowed_url=allowed_url,
+        )
+        static = request.model_dump(
+            exclude_none=True, exclude={"query", "max_result"}
+        )
+
+        self._filters = static
+        self._max_result = request.max_result
+        # Encoded filters without the opening brace, e.g. b',"country":"KE"}'.
+        self._suffix = b"," + _encode(static)[1:] if static else b"}"
+
+    def encode(self, query: str, max_result: Optional[int] = None) -> bytes:
+        """Return the JSON body for ``query`` with the template's filters."""
+        if not isinstance(query, str):
+            raise TypeError(f"query must be a str, not {type(query).__name__}")
+
+        if max_result is None:
+            max_result = self._max_result
+        elif isinstance(max_result, bool) or not isinstance(max_result, int):
+            raise TypeError(
+                f"max_result must be an int, not {type(max_result).__name__}"
+            )
+
+        body = b'{"query":' + _encode(query)
+        if max_result is not None:
+            body += b',"max_result":' + str(max_result).encode()
+        return body + self._suffix
+
+    def to_request(
+        self, query: str, max_result: Optional[int] = None
+    ) -> SearchRequest:
+        """Build the equivalent ``SearchRequest`` without re-validating."""
+        return SearchRequest.model_construct(
+            query=query,
+            max_result=self._max_result if max_result is None else max_result,
+            **self._filters,
+        )
+
+
+class PreparedSearch:
+    """Callable returned by ``AgentSearchClient.prepare()``."""
+
+    __slots__ = ("template", "_send")
+
+    def __init__(
+        self,
+        template: SearchTemplate,
+        send: Callable[
+            [SearchTemplate, str, Optional[int], Optional[float]], SearchResponse
+        ],
+    ) -> None:
+        self.template = template
+        self._send = send
+
+    def __call__(
+        self,
+        query: str,
+        *,
+        max_result: Optional[int] = None,
+        timeout_budget: Optional[float] = None,
+    ) -> SearchResponse:
+        return self._send(self.template, query, max_result, timeout_budget)
+
+
+class AsyncPreparedSearch:
+    """Callable returned by ``AsyncAgentSearchClient.prepare()``."""
+
+    __slots__ = ("template", "_send")
+
+    def __init__(
+        self,
+        template: SearchTemplate,
+        send: Callable[
+            [SearchTemplate, str, Optional[int], Optional[float]],
+            Awaitable[SearchResponse],
+        ],
+    ) -> None:
+        self.template = template
+        self._send = send
+
+    async def __call__(
+        self,
+        query: str,
+        *,
+        max_result: Optional[int] = None,
+        timeout_budget: Optional[float] = None,
+    ) -> SearchResponse:
+        return await self._send(self.template, query, max_result, timeout_budget)
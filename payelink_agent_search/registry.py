@@ -0,0 +1,237 @@
+import codecs
+import json
+import re
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
+
+from pydantic import BaseModel, ValidationError
+
+from .errors import InvalidResponseError, LimitExceededError
+from .models import RegistryAgent, RegistryOrganization
+
+REGISTRY_PATH = "/.well-known/agents.json"
+
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024
+DEFAULT_MAX_AGENTS = 10_000
+
+RegistryEntry = Union[RegistryOrganization, RegistryAgent]
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DECODER = json.JSONDecoder()
+
+# Parser states.
+_START = "start"
+_KEY = "key"
+_COLON = "colon"
+_VALUE = "value"
+_AFTER_VALUE = "after_value"
+_AGENT = "agent"
+_AFTER_AGENT = "after_agent"
+_END = "end"
+
+
+def registry_url(organization_url: str) -> str:
+    return organization_url.rstrip("/") + REGISTRY_PATH
+
+
+class RegistryParser:
+    """
+    Incremental parser for ``/.well-known/agents.json`` registries.
+
+    Feed the body chunk by chunk; each call returns the organization and
+    the ``agents[]`` entries completed by that chunk, so only the entry
+    being parsed is held in memory. Other top-level keys are skipped.
+
+    Parameters
+    ----------
+    max_bytes : int, default=5 MiB
+        Maximum size of the document.
+
+    max_agents : int, default=10000
+        Maximum number of ``agents[]`` entries.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_agents: int = DEFAULT_MAX_AGENTS,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.max_agents = max_agents
+        self.bytes_read = 0
+        self.agent_count = 0
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._state = _START
+        self._key = ""
+        self._seen_agents = False
+
+    def feed(self, chunk: bytes) -> List[RegistryEntry]:
+        self.bytes_read += len(chunk)
+        if self.bytes_read > self.max_bytes:
+            raise LimitExceededError(
+                f"Registry exceeds the maximum size of {self.max_bytes} bytes"
+            )
+        try:
+            self._buffer += self._decoder.decode(chunk)
+        except UnicodeDecodeError as e:
+            raise InvalidResponseError(f"Registry is not valid UTF-8: {e}") from e
+        return self._parse(final=False)
+
+    def close(self) -> List[RegistryEntry]:
+        """Parse what is left and check that the document is complete."""
+        try:
+            self._buffer += self._decoder.decode(b"", final=True)
+        except UnicodeDecodeError as e:
+            raise InvalidResponseError(f"Registry is not valid UTF-8: {e}") from e
+
+        entries = self._parse(final=True)
+        if self._state != _END:
+            raise InvalidResponseError("Registry document is incomplete")
+        if not self._seen_agents:
+            raise InvalidResponseError("Registry has no 'agents' list")
+        return entries
+
+    def _parse(self, final: bool) -> List[RegistryEntry]:
+        entries: List[RegistryEntry] = []
+        buffer = self._buffer
+        pos = 0
+
+        while True:
+            pos = _WHITESPACE.match(buffer, pos).end()
+            if pos == len(buffer):
+                break
+            char = buffer[pos]
+            state = self._state
+
+            if state == _START:
+                self._expect(char, "{")
+                pos += 1
+                self._state = _KEY
+            elif state in (_KEY, _AFTER_VALUE):
+                if char == "}":
+                    pos += 1
+                    self._state = _END
+                elif state == _AFTER_VALUE:
+                    self._expect(char, ",")
+                    pos += 1
+                    self._state = _KEY
+                else:
+                    self._expect(char, '"')
+                    decoded = self._decode(buffer, pos, final)
+                    if decoded is None:
+                        break
+                    self._key, pos = decoded
+                    self._state = _COLON
+            elif state == _COLON:
+                self._expect(char, ":")
+                pos += 1
+                self._state = _VALUE
+            elif state == _VALUE:
+                if self._key == "agents":
+                    self._expect(char, "[")
+                    pos += 1
+                    self._seen_agents = True
+                    self._state = _AGENT
+                    continue
+                decoded = self._decode(buffer, pos, final)
+                if decoded is None:
+                    break
+                value, pos = decoded
+                if self._key == "organization":
+                    entries.append(self._validate(RegistryOrganization, value))
+                self._state = _AFTER_VALUE
+            elif state in (_AGENT, _AFTER_AGENT):
+                if char == "]":
+                    pos += 1
+                    self._state = _AFTER_VALUE
+                elif state == _AFTER_AGENT:
+                    self._expect(char, ",")
+                    pos += 1
+                    self._state = _AGENT
+                else:
+                    decoded = self._decode(buffer, pos, final)
+                    if decoded is None:
+                        break
+                    value, pos = decoded
+                    self.agent_count += 1
+                    if self.agent_count > self.max_agents:
+                        raise LimitExceededError(
+                            f"Registry lists more than {self.max_agents} agents"
+                        )
+                    entries.append(self._validate(RegistryAgent, value))
+                    self._state = _AFTER_AGENT
+            else:
+                raise InvalidResponseError("Unexpected data after registry document")
+
+        self._buffer = buffer[pos:]
+        return entries
+
+    @staticmethod
+    def _expect(char: str, expected: str) -> None:
+        if char != expected:
+            raise InvalidResponseError(
+                f"Invalid registry: expected {expected!r}, found {char!r}"
+            )
+
+    @staticmethod
+    def _decode(buffer: str, pos: int, final: bool) -> Optional[Tuple[Any, int]]:
+        """Decode the JSON value at ``pos``, or None if more data is needed."""
+        try:
+            value, end = _DECODER.raw_decode(buffer, pos)
+        except json.JSONDecodeError as e:
+            if final:
+                raise InvalidResponseError(f"Invalid registry JSON: {e}") from e
+            return None
+        # A value that runs to the end of the buffer (e.g. a number) may
+        # continue in the next chunk.
+        if end == len(buffer) and not final:
+            return None
+        return value, end
+
+    @staticmethod
+    def _validate(model: Type[BaseModel], value: Any) -> Any:
+        if not isinstance(value, dict):
+            raise InvalidResponseError(
+                f"Invalid registry entry: expected an object, got {value!r}"
+            )
+        try:
+            return model(**value)
+        except ValidationError as e:
+            raise InvalidResponseError(f"Invalid registry entry: {e}") from e
+
+
+def iter_registry(
+    chunks: Iterable[bytes],
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    max_agents: int = DEFAULT_MAX_AGENTS,
+) -> Iterator[RegistryEntry]:
+    """Parse a registry from byte chunks, yielding entries as they complete."""
+    parser = RegistryParser(max_bytes=max_bytes, max_agents=max_agents)
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
+
+
+async def aiter_registry(
+    chunks: AsyncIterable[bytes],
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    max_agents: int = DEFAULT_MAX_AGENTS,
+) -> AsyncIterator[RegistryEntry]:
+    """Async variant of ``iter_registry()``."""
+    parser = RegistryParser(max_bytes=max_bytes, max_agents=max_agents)
+    async for chunk in chunks:
+        for entry in parser.feed(chunk):
+            yield entry
+    for entry in parser.close():
+        yield entry
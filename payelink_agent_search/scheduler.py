@@ -0,0 +1,436 @@
+import asyncio
+import hashlib
+import heapq
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from .models import RegistryAgent, RegistryOrganization
+from .registry import RegistryEntry
+
+
+@dataclass(frozen=True)
+class RefreshPolicy:
+    """
+    How often watched registries are polled.
+
+    Each registry starts at ``initial_interval``. After a poll that finds
+    no change the interval is multiplied by ``backoff``; after a change it
+    is multiplied by ``tighten``. It always stays within ``min_interval``
+    and ``max_interval``. Every poll time is randomized by ``jitter`` (a
+    fraction of the interval) so registries do not refresh in bursts.
+
+    Parameters
+    ----------
+    min_interval : float, default=60.0
+        Shortest time in seconds between two polls of a registry.
+
+    max_interval : float, default=86400.0
+        Longest time in seconds between two polls of a registry.
+
+    initial_interval : float, default=3600.0
+        Interval used until a registry's change rate is known.
+
+    backoff : float, default=1.5
+        Interval multiplier after an unchanged poll.
+
+    tighten : float, default=0.5
+        Interval multiplier after a poll that found a change.
+
+    jitter : float, default=0.1
+        Random spread applied to each interval, as a fraction of it.
+
+    initial_spread : float, default=5.0
+        First polls are spread randomly over this many seconds.
+
+    max_workers : int, default=4
+        Maximum number of registries fetched at the same time.
+    """
+
+    min_interval: float = 60.0
+    max_interval: float = 86400.0
+    initial_interval: float = 3600.0
+    backoff: float = 1.5
+    tighten: float = 0.5
+    jitter: float = 0.1
+    initial_spread: float = 5.0
+    max_workers: int = 4
+
+    def __post_init__(self) -> None:
+        if not 0 < self.min_interval <= self.max_interval:
+            raise ValueError("Expected 0 < min_interval <= max_interval")
+        if self.max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+
+
+@dataclass(frozen=True)
+class RegistrySnapshot:
+    organization_url: str
+    organization: Optional[RegistryOrganization]
+    agents: Tuple[RegistryAgent, ...]
+    digest: str
+    fetched_at: float
+
+    @classmethod
+    def from_entries(
+        cls, organization_url: str, entries: Iterable[RegistryEntry]
+    ) -> "RegistrySnapshot":
+        organization = None
+        agents = []
+        digest = hashlib.sha256()
+        for entry in entries:
+            digest.update(entry.model_dump_json().encode())
+            if isinstance(entry, RegistryOrganization):
+                organization = entry
+            else:
+                agents.append(entry)
+        return cls(
+            organization_url=organization_url,
+            organization=organization,
+            agents=tuple(agents),
+            digest=digest.hexdigest(),
+            fetched_at=time.time(),
+        )
+
+
+@dataclass(frozen=True)
+class RefreshStatus:
+    organization_url: str
+    interval: float
+    next_refresh_at: float
+    last_refreshed_at: Optional[float]
+    lag: float
+    checks: int
+    changes: int
+    failures: int
+    last_error: Optional[str]
+
+
+@dataclass
+class _Tracker:
+    interval: float
+    due: float
+    checks: int = 0
+    changes: int = 0
+    failures: int = 0
+    lag: float = 0.0
+    last_error: Optional[str] = None
+    snapshot: Optional[RegistrySnapshot] = None
+
+
+class _Schedule:
+    """Per-registry intervals and due times, shared by both schedulers."""
+
+    def __init__(self, policy: RefreshPolicy) -> None:
+        self.policy = policy
+        self._trackers: Dict[str, _Tracker] = {}
+        self._heap: List[Tuple[float, str]] = []
+        self._in_flight: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def add(self, url: str) -> None:
+        with self._lock:
+            if url in self._trackers:
+                return
+            due = time.monotonic() + random.uniform(0, self.policy.initial_spread)
+            self._trackers[url] = _Tracker(
+                interval=self.policy.initial_interval, due=due
+            )
+            heapq.heappush(self._heap, (due, url))
+
+    def remove(self, url: str) -> None:
+        with self._lock:
+            self._trackers.pop(url, None)
+
+    def next_due(self) -> Optional[float]:
+        """Monotonic time of the earliest pending refresh."""
+        with self._lock:
+            self._drop_stale()
+            return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: float) -> Optional[str]:
+        with self._lock:
+            self._drop_stale()
+            if not self._heap or self._heap[0][0] > now:
+                return None
+            due, url = heapq.heappop(self._heap)
+            tracker = self._trackers[url]
+            tracker.lag = max(0.0, now - due)
+            self._in_flight.add(url)
+            return url
+
+    def record(
+        self,
+        url: str,
+        snapshot: Optional[RegistrySnapshot],
+        error: Optional[BaseException] = None,
+    ) -> None:
+        with self._lock:
+            self._in_flight.discard(url)
+            tracker = self._trackers.get(url)
+            if tracker is None:
+                return
+
+            policy = self.policy
+            tracker.checks += 1
+            if snapshot is None:
+                tracker.failures += 1
+                tracker.last_error = str(error)
+            else:
+                previous = tracker.snapshot
+                if previous is not None:
+                    if previous.digest != snapshot.digest:
+                        tracker.changes += 1
+                        tracker.interval *= policy.tighten
+                    else:
+                        tracker.interval *= policy.backoff
+                    tracker.interval = min(
+                        policy.max_interval,
+                        max(policy.min_interval, tracker.interval),
+                    )
+                tracker.snapshot = snapshot
+                tracker.last_error = None
+
+            spread = tracker.interval * policy.jitter
+            tracker.due = time.monotonic() + tracker.interval + random.uniform(
+                -spread, spread
+            )
+            heapq.heappush(self._heap, (tracker.due, url))
+
+    def snapshot(self, url: str) -> Optional[RegistrySnapshot]:
+        with self._lock:
+            tracker = self._trackers.get(url)
+            return None if tracker is None else tracker.snapshot
+
+    def status(self) -> List[RefreshStatus]:
+        now = time.monotonic()
+        wall = time.time()
+        statuses = []
+        with self._lock:
+            for url, tracker in self._trackers.items():
+                # An overdue refresh that has not started yet is lagging now;
+                # otherwise report how late the last refresh started.
+                lag = tracker.lag
+                if url not in self._in_flight:
+                    lag = max(lag, now - tracker.due)
+                snapshot = tracker.snapshot
+                statuses.append(
+                    RefreshStatus(
+                        organization_url=url,
+                        interval=tracker.interval,
+                        next_refresh_at=wall + (tracker.due - now),
+                        last_refreshed_at=(
+                            None if snapshot is None else snapshot.fetched_at
+                        ),
+                        lag=lag,
+                        checks=tracker.checks,
+                        changes=tracker.changes,
+                        failures=tracker.failures,
+                        last_error=tracker.last_error,
+                    )
+                )
+        return statuses
+
+    def _drop_stale(self) -> None:
+        # Entries for removed registries or superseded due times.
+        while self._heap:
+            due, url = self._heap[0]
+            tracker = self._trackers.get(url)
+            if tracker is not None and tracker.due == due:
+                return
+            heapq.heappop(self._heap)
+
+
+class RefreshScheduler:
+    """
+    Keeps registries fresh in the background using a thread pool.
+
+    Created by ``AgentSearchClient.watch_registries()`` and stopped when
+    the client is closed.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str], RegistrySnapshot],
+        policy: Optional[RefreshPolicy] = None,
+    ) -> None:
+        self.policy = policy or RefreshPolicy()
+        self._fetch = fetch
+        self._schedule = _Schedule(self.policy)
+        self._wakeup = threading.Condition()
+        self._stopped = False
+        self._slots = threading.Semaphore(self.policy.max_workers)
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, organization_url: str) -> None:
+        self._schedule.add(organization_url)
+        with self._wakeup:
+            self._wakeup.notify()
+
+    def remove(self, organization_url: str) -> None:
+        self._schedule.remove(organization_url)
+
+    def snapshot(self, organization_url: str) -> Optional[RegistrySnapshot]:
+        """Latest copy of a registry, or None before its first refresh."""
+        return self._schedule.snapshot(organization_url)
+
+    def status(self) -> List[RefreshStatus]:
+        return self._schedule.status()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.policy.max_workers,
+            thread_name_prefix="payelink-registry-refresh",
+        )
+        self._thread = threading.Thread(
+            target=self._run, name="payelink-registry-scheduler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop scheduling and wait for in-flight refreshes to finish."""
+        with self._wakeup:
+            self._stopped = True
+            self._wakeup.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def _run(self) -> None:
+        while True:
+            with self._wakeup:
+                if self._stopped:
+                    return
+                due = self._schedule.next_due()
+                delay = None if due is None else due - time.monotonic()
+                if delay is None or delay > 0:
+                    self._wakeup.wait(delay)
+                    continue
+
+            # Bound the number of refreshes in flight to max_workers.
+            self._slots.acquire()
+            url = self._schedule.pop_due(time.monotonic())
+            if url is None or self._stopped:
+                self._slots.release()
+                continue
+            self._pool.submit(self._refresh, url)
+
+    def _refresh(self, url: str) -> None:
+        try:
+            snapshot = self._fetch(url)
+        except Exception as e:
+            self._schedule.record(url, None, e)
+        else:
+            self._schedule.record(url, snapshot)
+        finally:
+            self._slots.release()
+            with self._wakeup:
+                self._wakeup.notify()
+
+
+class AsyncRefreshScheduler:
+    """
+    Keeps registries fresh in the background using asyncio tasks.
+
+    Created by ``AsyncAgentSearchClient.watch_registries()`` and stopped
+    when the client is closed.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str], Awaitable[RegistrySnapshot]],
+        policy: Optional[RefreshPolicy] = None,
+    ) -> None:
+        self.policy = policy or RefreshPolicy()
+        self._fetch = fetch
+        self._schedule = _Schedule(self.policy)
+        self._wakeup: Optional[asyncio.Event] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._task: Optional[asyncio.Task] = None
+        self._refreshes: Set[asyncio.Task] = set()
+
+    def add(self, organization_url: str) -> None:
+        self._schedule.add(organization_url)
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def remove(self, organization_url: str) -> None:
+        self._schedule.remove(organization_url)
+
+    def snapshot(self, organization_url: str) -> Optional[RegistrySnapshot]:
+        """Latest copy of a registry, or None before its first refresh."""
+        return self._schedule.snapshot(organization_url)
+
+    def status(self) -> List[RefreshStatus]:
+        return self._schedule.status()
+
+    def start(self) -> None:
+        """Start refreshing; must be called from a running event loop."""
+        if self._task is not None:
+            return
+        self._wakeup = asyncio.Event()
+        self._slots = asyncio.Semaphore(self.policy.max_workers)
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop scheduling and cancel in-flight refreshes."""
+        tasks = list(self._refreshes)
+        if self._task is not None:
+            tasks.append(self._task)
+            self._task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run(self) -> None:
+        while True:
+            due = self._schedule.next_due()
+            delay = None if due is None else due - time.monotonic()
+            if delay is None or delay > 0:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            # Bound the number of refreshes in flight to max_workers.
+            await self._slots.acquire()
+            url = self._schedule.pop_due(time.monotonic())
+            if url is None:
+                self._slots.release()
+                continue
+            task = asyncio.create_task(self._refresh(url))
+            self._refreshes.add(task)
+            task.add_done_callback(self._refreshes.discard)
+
+    async def _refresh(self, url: str) -> None:
+        try:
+            snapshot = await self._fetch(url)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._schedule.record(url, None, e)
+        else:
+            self._schedule.record(url, snapshot)
+        finally:
+            self._slots.release()
+            self._wakeup.set()
@@ -0,0 +1,139 @@
+import heapq
+from dataclasses import dataclass
+from typing import Any, Dict, List, Literal, Optional, Sequence, Tuple, Union
+
+from .errors import SdkError
+from .models import SearchRequest
+
+# Limit of sharded searches sent without ``max_result`` (the API's
+# documented default). Every shard request carries it explicitly, and the
+# merge trims to it, so a sharded search returns as many agents as the
+# same search unsharded.
+DEFAULT_MAX_RESULT = 2
+
+
+@dataclass(frozen=True)
+class ShardPolicy:
+    """
+    Opt-in fan-out of searches with long ``allowed_url`` lists.
+
+    Searches whose ``allowed_url`` holds more than ``shard_size`` URLs are
+    split into one request per chunk. The chunks are searched concurrently
+    and their results merged into a single top ``max_result`` list.
+
+    Parameters
+    ----------
+    shard_size : int, default=50
+        Maximum number of URLs per shard request.
+
+    max_concurrency : int, default=8
+        Maximum number of shard requests in flight per search.
+
+    on_error : {"raise", "partial"}, default="raise"
+        ``"raise"`` fails the search when any shard fails. ``"partial"``
+        returns the merged results of the shards that succeeded, with the
+        failures listed in ``SearchResponse.shard_errors``. The search still
+        fails if every shard fails.
+    """
+
+    shard_size: int = 50
+    max_concurrency: int = 8
+    on_error: Literal["raise", "partial"] = "raise"
+
+    def __post_init__(self) -> None:
+        if self.shard_size < 1:
+            raise ValueError("shard_size must be at least 1")
+        if self.max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
+    def split(self, request: SearchRequest) -> Optional[List[SearchRequest]]:
+        """Shard requests for ``request``, or None if it is not sharded."""
+        urls = request.allowed_url
+        if not urls or len(urls) <= self.shard_size:
+            return None
+        max_result = request.max_result
+        if max_result is None:
+            max_result = DEFAULT_MAX_RESULT
+        return [
+            request.model_copy(
+                update={
+                    "allowed_url": urls[i : i + self.shard_size],
+                    "max_result": max_result,
+                }
+            )
+            for i in range(0, len(urls), self.shard_size)
+        ]
+
+
+def _identity(agent: Dict[str, Any]) -> Optional[str]:
+    return agent.get("agent_id") or agent.get("agent_url")
+
+
+def merge_shard_results(
+    shards: Sequence[SearchRequest],
+    results: Sequence[Union[Dict[str, Any], SdkError]],
+    max_result: Optional[int],
+    on_error: Literal["raise", "partial"],
+) -> Dict[str, Any]:
+    """
+    Merge raw shard results into one raw result.
+
+    Agents are ranked by their ``score`` when every agent carries one, and
+    otherwise by their rank within their shard, so the top agents of all
+    shards interleave. Duplicates (by ``agent_id``, then ``agent_url``)
+    keep their best rank, and a bounded heap selects the top
+    ``max_result`` (``DEFAULT_MAX_RESULT`` when None, as in ``split()``).
+    """
+    errors = []
+    ranked: List[Tuple[Dict[str, Any], int, int]] = []
+    for index, (shard, result) in enumerate(zip(shards, results)):
+        if isinstance(result, SdkError):
+            error = str(result)
+        elif not result.get("success"):
+            error = result.get("error") or "Shard search failed"
+        else:
+            for rank, agent in enumerate(result.get("data", [])):
+                ranked.append((agent, rank, index))
+            continue
+
+        if on_error == "raise":
+            if isinstance(result, SdkError):
+                raise result
+            raise SdkError(f"Shard {index} failed: {error}")
+        errors.append(
+            {"shard": index, "allowed_url": shard.allowed_url, "error": error}
+        )
+
+    if len(errors) == len(shards):
+        raise SdkError(f"All {len(shards)} shards failed: {errors[0]['error']}")
+
+    use_score = all(
+        isinstance(agent.get("score"), (int, float)) for agent, _, _ in ranked
+    )
+
+    def sort_key(item: Tuple[Dict[str, Any], int, int]) -> Tuple[float, int, int]:
+        agent, rank, index = item
+        primary = -agent["score"] if use_score else rank
+        return (primary, rank, index)
+
+    best: Dict[Any, Tuple[Dict[str, Any], int, int]] = {}
+    for item in ranked:
+        identity = _identity(item[0])
+        if identity is None:
+            # Agents without an identity cannot be deduplicated.
+            identity = id(item[0])
+        current = best.get(identity)
+        if current is None or sort_key(item) < sort_key(current):
+            best[identity] = item
+
+    limit = DEFAULT_MAX_RESULT if max_result is None else max_result
+    merged = [
+        agent for agent, _, _ in heapq.nsmallest(limit, best.values(), key=sort_key)
+    ]
+
+    return {
+        "success": True,
+        "data": merged,
+        "message": f"Found {len(merged)} agent(s)",
+        "shard_errors": errors,
+    }
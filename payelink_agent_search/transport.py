@@ -1,10 +1,47 @@
-from typing import Any, Dict, Optional
+import json
+from typing import Any, AsyncIterator, Dict, Iterator, Optional
 
 import httpx
 
 from .config import ClientConfig
+from .deadline import Deadline
 from .errors import HttpStatusError, InvalidResponseError, NetworkError, TimeoutError
 
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def _attempt_timeout(
+    config: ClientConfig, deadline: Optional[Deadline], url: str
+) -> Any:
+    """Timeout for the next attempt, capped by what is left of the deadline."""
+    if deadline is None:
+        return httpx.USE_CLIENT_DEFAULT
+    remaining = deadline.remaining()
+    if remaining <= 0:
+        raise TimeoutError(f"Deadline exceeded calling {url}")
+    return min(config.timeout, remaining)
+
+
+def _read_body(
+    response: httpx.Response, deadline: Optional[Deadline], url: str
+) -> bytes:
+    """
+    Read a streamed response body, failing once ``deadline`` has passed.
+
+    httpx only bounds each network operation, so a response that trickles
+    in could otherwise keep an attempt running past the deadline.
+    """
+    if deadline is None:
+        return response.read()
+    chunks = []
+    for chunk in response.iter_bytes():
+        if deadline.expired:
+            break
+        chunks.append(chunk)
+    if deadline.expired:
+        raise TimeoutError(f"Deadline exceeded calling {url}")
+    return b"".join(chunks)
+
 
 class Transport:
     def __init__(
@@ -32,15 +69,67 @@ class Transport:
     def close(self)-> None:
         self._client.close()
 
+    def stream_bytes(self, url: str) -> Iterator[bytes]:
+        """Stream the body of a GET to an organization-hosted URL."""
+        request = self._client.build_request("GET", url)
+        # Organizations host their own registries; never send them the API key.
+        request.headers.pop("Authorization", None)
+        try:
+            response = self._client.send(request, stream=True)
+            try:
+                if response.status_code >= 400:
+                    response.read()
+                    raise HttpStatusError(
+                        response.status_code,
+                        f"HTTP {response.status_code} calling {url}",
+                        body=response.text,
+                    )
+                yield from response.iter_bytes()
+            finally:
+                response.close()
+        except httpx.TimeoutException as e:
+            raise TimeoutError(f"Request timed out calling {url}") from e
+        except httpx.RequestError as e:
+            raise NetworkError(f"Network error calling path {url}: {e}") from e
+
 
-    def post_json(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    def post_json(
+        self,
+        path: str,
+        payload: Dict[str, Any],
+        deadline: Optional[Deadline] = None,
+    ) -> Dict[str, Any]:
+        return self._post(path, deadline, json=payload)
+
+    def post_encoded(
+        self,
+        path: str,
+        content: bytes,
+        deadline: Optional[Deadline] = None,
+    ) -> Dict[str, Any]:
+        """Post a body that is already JSON-encoded."""
+        return self._post(path, deadline, content=content, headers=_JSON_HEADERS)
+
+    def _post(
+        self, path: str, deadline: Optional[Deadline], **request: Any
+    ) -> Dict[str, Any]:
 
         last_exception: Optional[Exception] = None
 
         for attempt in range(self._config.retries + 1):
+            url = f"{self._config.base_url}{path}"
+            timeout = _attempt_timeout(self._config, deadline, url)
             try:
-                url = f"{self._config.base_url}{path}"
-                response = self._client.post(url, json=payload)
+                response = self._client.send(
+                    self._client.build_request(
+                        "POST", url, timeout=timeout, **request
+                    ),
+                    stream=True,
+                )
+                try:
+                    body = _read_body(response, deadline, url)
+                finally:
+                    response.close()
 
                 if response.status_code >= 400:
                     error_msg = f"HTTP {response.status_code} calling {url}"
@@ -54,11 +143,11 @@ class Transport:
                     raise HttpStatusError(
                         response.status_code,
                         error_msg,
-                        body=response.text
+                        body=body.decode(response.encoding or "utf-8", "replace"),
                     )
 
                 try:
-                    data = response.json()
+                    data = json.loads(body)
                 except Exception as e:
                     raise InvalidResponseError(f"Invalid JSON response: {e}") from e
 
@@ -72,7 +161,9 @@ class Transport:
             except httpx.TimeoutException as e:
                 last_exception = e
 
-                if attempt == self._config.retries:
+                if attempt == self._config.retries or (
+                    deadline is not None and deadline.expired
+                ):
                     raise TimeoutError(f"Request timed out calling {url}") from e
             except httpx.RequestError as e:
                 last_exception = e
@@ -109,13 +200,70 @@ class AsyncTransport:
     async def close(self) -> None:
         await self._client.aclose()
 
-    async def post_json(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    async def stream_bytes(self, url: str) -> AsyncIterator[bytes]:
+        """Stream the body of a GET to an organization-hosted URL."""
+        request = self._client.build_request("GET", url)
+        # Organizations host their own registries; never send them the API key.
+        request.headers.pop("Authorization", None)
+        try:
+            response = await self._client.send(request, stream=True)
+            try:
+                if response.status_code >= 400:
+                    await response.aread()
+                    raise HttpStatusError(
+                        response.status_code,
+                        f"HTTP {response.status_code} calling {url}",
+                        body=response.text,
+                    )
+                async for chunk in response.aiter_bytes():
+                    yield chunk
+            finally:
+                await response.aclose()
+        except httpx.TimeoutException as e:
+            raise TimeoutError(f"Request timed out calling {url}") from e
+        except httpx.RequestError as e:
+            raise NetworkError(f"Network error calling path {url}: {e}") from e
+
+    async def post_json(
+        self,
+        path: str,
+        payload: Dict[str, Any],
+        deadline: Optional[Deadline] = None,
+    ) -> Dict[str, Any]:
+        return await self._post(path, deadline, json=payload)
+
+    async def post_encoded(
+        self,
+        path: str,
+        content: bytes,
+        deadline: Optional[Deadline] = None,
+    ) -> Dict[str, Any]:
+        """Post a body that is already JSON-encoded."""
+        return await self._post(
+            path, deadline, content=content, headers=_JSON_HEADERS
+        )
+
+    async def _post(
+        self, path: str, deadline: Optional[Deadline], **request: Any
+    ) -> Dict[str, Any]:
+        # Imported here so that sync-only code never loads asyncio.
+        import asyncio
+
         last_exception: Optional[Exception] = None
 
         for attempt in range(self._config.retries + 1):
+            url = f"{self._config.base_url}{path}"
+            timeout = _attempt_timeout(self._config, deadline, url)
             try:
-                url = f"{self._config.base_url}{path}"
-                response = await self._client.post(url, json=payload)
+                # httpx timeouts apply per network operation; asyncio.timeout
+                # bounds the whole attempt and cancels it (closing the pooled
+                # connection) once the deadline passes.
+                async with asyncio.timeout(
+                    None if deadline is None else deadline.remaining()
+                ):
+                    response = await self._client.post(
+                        url, timeout=timeout, **request
+                    )
 
                 if response.status_code >= 400:
                     error_msg = f"HTTP {response.status_code} calling {url}"
@@ -142,10 +290,14 @@ class AsyncTransport:
 
                 return data
 
+            except asyncio.TimeoutError as e:
+                raise TimeoutError(f"Deadline exceeded calling {url}") from e
             except httpx.TimeoutException as e:
                 last_exception = e
 
-                if attempt == self._config.retries:
+                if attempt == self._config.retries or (
+                    deadline is not None and deadline.expired
+                ):
                     raise TimeoutError(f"Request timed out calling {url}") from e
             except httpx.RequestError as e:
                 last_exception = e
@@ -0,0 +1,288 @@
+import argparse
+import asyncio
+import contextvars
+import json
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from pydantic import ValidationError
+
+from .cache import request_key
+from .deadline import Deadline
+from .errors import SdkError
+from .models import SearchRequest, SearchResponse
+
+WarmupSource = Union[str, Path, Iterable[Union[str, Dict[str, Any]]]]
+
+# Keys that give a request's weight in a frequency-ranked list.
+_COUNT_KEYS = ("count", "frequency")
+
+
+@dataclass
+class WarmupReport:
+    """Progress and outcome of a cache warm-up."""
+
+    total: int
+    skipped: int = 0
+    warmed: int = 0
+    already_cached: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+    completed: bool = False
+
+    @property
+    def done(self) -> int:
+        return self.warmed + self.already_cached + self.failed
+
+    @property
+    def coverage(self) -> float:
+        """Share of the hot set that is in the cache."""
+        if not self.total:
+            return 1.0
+        return (self.warmed + self.already_cached) / self.total
+
+
+def _records(source: WarmupSource) -> Iterable[Union[str, Dict[str, Any]]]:
+    if isinstance(source, (str, Path)):
+        with open(source, encoding="utf-8") as f:
+            yield from f
+    else:
+        yield from source
+
+
+def load_hot_set(
+    source: WarmupSource, top_n: int = 100
+) -> Tuple[List[SearchRequest], int]:
+    """
+    Pick the ``top_n`` most frequent distinct requests from a query log.
+
+    ``source`` is a path to a JSONL file, or an iterable of JSON lines or
+    dicts. Each record holds ``SearchRequest`` fields. A ``count`` (or
+    ``frequency``) field weights the record, so a frequency-ranked list
+    works as well as a raw log. Requests are deduplicated by their
+    normalized cache key. Ties keep their order of first appearance.
+
+    Returns the selected requests and the number of records skipped
+    because they could not be parsed.
+    """
+    counts: Dict[str, float] = {}
+    requests: Dict[str, SearchRequest] = {}
+    skipped = 0
+
+    for record in _records(source):
+        if isinstance(record, str):
+            if not record.strip():
+                continue
+            try:
+                record = json.loads(record)
+            except json.JSONDecodeError:
+                skipped += 1
+                continue
+        if not isinstance(record, dict):
+            skipped += 1
+            continue
+
+        fields = {k: v for k, v in record.items() if k not in _COUNT_KEYS}
+        # Like search(), send no max_result unless the record sets one, so
+        # warmed entries use the same body and cache key as live searches.
+        fields.setdefault("max_result", None)
+        weight = next((record[k] for k in _COUNT_KEYS if k in record), 1)
+        try:
+            request = SearchRequest(**fields)
+            weight = float(weight)
+        except (ValidationError, TypeError, ValueError):
+            skipped += 1
+            continue
+
+        key = request_key(request)
+        requests.setdefault(key, request)
+        counts[key] = counts.get(key, 0) + weight
+
+    ranked = sorted(requests, key=lambda key: -counts[key])
+    return [requests[key] for key in ranked[:top_n]], skipped
+
+
+class _RateLimiter:
+    """Spaces request starts at least ``1 / rate`` seconds apart."""
+
+    def __init__(self, rate: Optional[float]) -> None:
+        self._interval = 1.0 / rate if rate else 0.0
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Reserve the next start slot and return how long to wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self._interval
+            return start - now
+
+
+def run_warmup(
+    execute: Callable[[SearchRequest, Optional[float]], SearchResponse],
+    requests: List[SearchRequest],
+    report: WarmupReport,
+    concurrency: int = 4,
+    rate: Optional[float] = 10.0,
+    deadline: Optional[float] = None,
+    progress: Optional[Callable[[WarmupReport], None]] = None,
+) -> WarmupReport:
+    """Warm ``requests`` on a thread pool; see ``AgentSearchClient.warm()``."""
+    started = time.monotonic()
+    limit = None if deadline is None else Deadline.after(deadline)
+    limiter = _RateLimiter(rate)
+    lock = threading.Lock()
+
+    def warm_one(request: SearchRequest) -> None:
+        delay = limiter.reserve()
+        if limit is not None and delay >= limit.remaining():
+            return
+        time.sleep(delay)
+        try:
+            response = execute(request, None if limit is None else limit.remaining())
+        except SdkError:
+            outcome = "failed"
+        else:
+            outcome = "already_cached" if response.served_locally else "warmed"
+        with lock:
+            setattr(report, outcome, getattr(report, outcome) + 1)
+            report.elapsed = time.monotonic() - started
+            if progress is not None:
+                progress(report)
+
+    pending: Set[Future] = set()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for request in requests:
+            if limit is not None and limit.expired:
+                break
+            if len(pending) >= concurrency:
+                _, pending = wait(pending, return_when=FIRST_COMPLETED)
+            # Run under the caller's context so a surrounding
+            # deadline_scope() applies to the warm-up requests.
+            context = contextvars.copy_context()
+            pending.add(pool.submit(context.run, warm_one, request))
+
+    report.elapsed = time.monotonic() - started
+    report.completed = report.done == report.total
+    return report
+
+
+async def arun_warmup(
+    execute: Callable[[SearchRequest, Optional[float]], Awaitable[SearchResponse]],
+    requests: List[SearchRequest],
+    report: WarmupReport,
+    concurrency: int = 4,
+    rate: Optional[float] = 10.0,
+    deadline: Optional[float] = None,
+    progress: Optional[Callable[[WarmupReport], None]] = None,
+) -> WarmupReport:
+    """Async variant of ``run_warmup()``."""
+    started = time.monotonic()
+    limit = None if deadline is None else Deadline.after(deadline)
+    limiter = _RateLimiter(rate)
+    slots = asyncio.Semaphore(concurrency)
+
+    async def warm_one(request: SearchRequest) -> None:
+        try:
+            delay = limiter.reserve()
+            if limit is not None and delay >= limit.remaining():
+                return
+            await asyncio.sleep(delay)
+            try:
+                response = await execute(
+                    request, None if limit is None else limit.remaining()
+                )
+            except SdkError:
+                outcome = "failed"
+            else:
+                outcome = "already_cached" if response.served_locally else "warmed"
+            setattr(report, outcome, getattr(report, outcome) + 1)
+            report.elapsed = time.monotonic() - started
+            if progress is not None:
+                progress(report)
+        finally:
+            slots.release()
+
+    tasks = []
+    for request in requests:
+        await slots.acquire()
+        if limit is not None and limit.expired:
+            slots.release()
+            break
+        tasks.append(asyncio.create_task(warm_one(request)))
+    await asyncio.gather(*tasks)
+
+    report.elapsed = time.monotonic() - started
+    report.completed = report.done == report.total
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point: ``python -m payelink_agent_search.warmup``."""
+    parser = argparse.ArgumentParser(
+        prog="payelink-warm",
+        description=(
+            "Replay the most frequent searches from a JSONL query log "
+            "against the Agent Search API."
+        ),
+    )
+    parser.add_argument("source", help="JSONL file of SearchRequest records")
+    parser.add_argument("--top", type=int, default=100, help="distinct requests")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--rate", type=float, default=10.0, help="requests/second")
+    parser.add_argument("--deadline", type=float, help="stop after this many seconds")
+    parser.add_argument("--quiet", action="store_true", help="only print the summary")
+    args = parser.parse_args(argv)
+
+    from .cache import ResponseCache
+    from .client import AgentSearchClient
+
+    def show(report: WarmupReport) -> None:
+        print(
+            f"\r{report.done}/{report.total} requests "
+            f"({report.failed} failed)",
+            end="",
+            file=sys.stderr,
+            flush=True,
+        )
+
+    with AgentSearchClient(cache=ResponseCache(maxsize=max(args.top, 1))) as client:
+        report = client.warm(
+            args.source,
+            top_n=args.top,
+            concurrency=args.concurrency,
+            rate=args.rate,
+            deadline=args.deadline,
+            progress=None if args.quiet else show,
+        )
+
+    if not args.quiet:
+        print(file=sys.stderr)
+    print(
+        f"Warmed {report.warmed + report.already_cached}/{report.total} "
+        f"({report.coverage:.0%}) in {report.elapsed:.1f}s; "
+        f"{report.failed} failed, {report.skipped} skipped"
+        + ("" if report.completed else "; stopped at deadline")
+    )
+    return 0 if report.completed and not report.failed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""Tests for the near-duplicate (MinHash/LSH) cache tier."""
+import pytest
+import respx
+
+from payelink_agent_search import AgentSearchClient, ApproximateIndex, ResponseCache
+from payelink_agent_search.approximate import normalize_text, shingles
+from payelink_agent_search.config import ClientConfig
+from payelink_agent_search.models import SearchRequest
+from payelink_agent_search.transport import Transport
+
+SEARCH_URL = "https://api.payelink.example/v1/agents/search"
+
+RESULT = {
+    "success": True,
+    "message": "Found 1 agent(s)",
+    "data": [{"agent_id": "fx", "agent_name": "Currency Converter"}],
+}
+
+
+def test_normalize_text_strips_case_and_symbols():
+    """Case, punctuation and symbols do not affect the normalized text."""
+    assert normalize_text("Convert USD → KES, please!") == "convert usd kes please"
+    assert shingles("ab") == {"ab"}
+
+
+def test_signature_is_deterministic():
+    """Signatures are stable across index instances."""
+    assert ApproximateIndex().signature("fx") == ApproximateIndex().signature("fx")
+
+
+def test_near_duplicates_match_and_unrelated_do_not():
+    """Similar queries match above the threshold; unrelated ones do not."""
+    index = ApproximateIndex(threshold=0.6)
+    index.add("k1", "Convert USD to KES", filters="{}")
+
+    key, similarity = index.match("convert usd into kes", filters="{}")
+    assert key == "k1"
+    assert similarity >= 0.6
+    assert index.match("book a flight to Nairobi", filters="{}") is None
+
+
+def test_filters_must_match_exactly():
+    """A similar query with different hard filters never matches."""
+    index = ApproximateIndex()
+    index.add("k1", "Convert USD to KES", filters='{"country": "KE"}')
+
+    assert index.match("convert usd to kes!", filters='{"country": "KE"}')
+    assert index.match("convert usd to kes!", filters='{"country": "NG"}') is None
+
+
+def test_remove_drops_buckets():
+    """Removed keys are no longer returned."""
+    index = ApproximateIndex()
+    index.add("k1", "Convert USD to KES", filters="{}")
+    index.remove("k1")
+    assert len(index) == 0
+    assert index.match("Convert USD to KES", filters="{}") is None
+
+
+def test_num_perm_must_divide_into_bands():
+    """Invalid band configuration is rejected."""
+    with pytest.raises(ValueError):
+        ApproximateIndex(num_perm=10, bands=3)
+
+
+def test_cache_serves_near_duplicate():
+    """The cache serves a cached result for a near-duplicate query."""
+    cache = ResponseCache(approximate=ApproximateIndex(threshold=0.6))
+    cache.store(SearchRequest(query="Convert USD to KES"), RESULT)
+
+    served = cache.lookup(SearchRequest(query="convert USD into KES"))
+    assert served["data"] == RESULT["data"]
+    assert cache.stats.approximate_hits == 1
+    assert cache.stats.approximate_hit_rate == 1.0
+
+
+def test_cache_shadow_mode_counts_without_serving():
+    """In shadow mode would-be hits are recorded but not served."""
+    index = ApproximateIndex(shadow=True)
+    cache = ResponseCache(approximate=index)
+    cache.store(SearchRequest(query="Convert USD to KES"), RESULT)
+
+    assert cache.lookup(SearchRequest(query="convert usd to kes!!")) is None
+    assert cache.stats.shadow_hits == 1
+    assert cache.stats.misses == 1
+    assert cache.stats.shadow_hit_rate == 1.0
+    match = index.shadow_matches[-1]
+    assert match.matched_query == "Convert USD to KES"
+    assert match.similarity == 1.0
+
+
+def test_evicted_entries_leave_the_index():
+    """Evicting a cache entry removes it from the approximate index."""
+    index = ApproximateIndex()
+    cache = ResponseCache(maxsize=1, approximate=index)
+    cache.store(SearchRequest(query="Convert USD to KES"), RESULT)
+    cache.store(SearchRequest(query="Book a flight"), RESULT)
+    assert len(index) == 1
+
+
+@respx.mock
+def test_client_serves_near_duplicate_locally():
+    """A near-duplicate search through the client skips the round trip."""
+    route = respx.post(SEARCH_URL).mock(
+        return_value=respx.MockResponse(200, json=RESULT)
+    )
+    config = ClientConfig(base_url="https://api.payelink.example", retries=0)
+    cache = ResponseCache(approximate=ApproximateIndex())
+    client = AgentSearchClient(api_key="test", cache=cache)
+    client._transport = Transport(config)
+
+    client.search("Convert USD to KES")
+    response = client.search("convert usd to KES?")
+
+    assert route.call_count == 1
+    assert response.served_locally is True
+    assert response.agents[0].agent_id == "fx"
+    client.close()
@@ -0,0 +1,171 @@
+"""Tests for the response cache and its use by the clients."""
+import pytest
+import respx
+
+from payelink_agent_search import (
+    AgentSearchClient,
+    AsyncAgentSearchClient,
+    ResponseCache,
+)
+from payelink_agent_search.cache import request_key
+from payelink_agent_search.config import ClientConfig
+from payelink_agent_search.models import SearchRequest
+from payelink_agent_search.transport import AsyncTransport, Transport
+
+SEARCH_URL = "https://api.payelink.example/v1/agents/search"
+
+UNFILTERED = {
+    "success": True,
+    "message": "Found 3 agent(s)",
+    "data": [
+        {"agent_id": "a", "country": "KE", "capabilities": {"streaming": True}},
+        {"agent_id": "b", "country": "NG", "capabilities": {"streaming": True}},
+        {"agent_id": "c", "country": "KE", "capabilities": {"streaming": False}},
+    ],
+}
+
+
+def _client(cache):
+    config = ClientConfig(base_url="https://api.payelink.example", retries=0)
+    client = AgentSearchClient(api_key="test", cache=cache)
+    client._transport = Transport(config)
+    return client
+
+
+def test_request_key_normalizes_whitespace_and_list_order():
+    """Equivalent requests share a cache key."""
+    left = SearchRequest(query=" Convert  USD to KES", allowed_url=["b", "a"])
+    right = SearchRequest(query="Convert USD to KES ", allowed_url=["a", "b"])
+    assert request_key(left) == request_key(right)
+    assert request_key(left) != request_key(SearchRequest(query="Convert USD"))
+
+
+def test_cache_evicts_least_recently_used():
+    """The cache keeps at most maxsize entries."""
+    cache = ResponseCache(maxsize=2)
+    for query in ("one", "two", "three"):
+        cache.store(SearchRequest(query=query), UNFILTERED)
+
+    assert len(cache) == 2
+    assert cache.lookup(SearchRequest(query="one")) is None
+    assert cache.lookup(SearchRequest(query="three")) is not None
+
+
+def test_cache_expires_entries():
+    """Entries older than ttl are not served."""
+    cache = ResponseCache(ttl=0)
+    cache.store(SearchRequest(query="one"), UNFILTERED)
+    assert cache.lookup(SearchRequest(query="one")) is None
+    assert len(cache) == 0
+
+
+def test_cache_skips_unsuccessful_results():
+    """Failed API results are never cached."""
+    cache = ResponseCache()
+    cache.store(SearchRequest(query="one"), {"success": False, "data": []})
+    assert len(cache) == 0
+
+
+def test_unbounded_result_does_not_answer_larger_limit():
+    """A result cached without max_result may be truncated by the API."""
+    cache = ResponseCache()
+    raw = {"success": True, "data": UNFILTERED["data"][:2]}
+    cache.store(SearchRequest(query="x", max_result=None), raw)
+
+    assert cache.lookup(SearchRequest(query="x", max_result=5)) is None
+    assert cache.lookup(SearchRequest(query="x", max_result=None)) is not None
+
+
+@respx.mock
+def test_repeated_search_served_from_cache():
+    """An identical search is answered without a round trip."""
+    route = respx.post(SEARCH_URL).mock(
+        return_value=respx.MockResponse(200, json=UNFILTERED)
+    )
+    cache = ResponseCache()
+    client = _client(cache)
+
+    first = client.search("fx", max_result=3)
+    second = client.search("fx", max_result=3)
+
+    assert route.call_count == 1
+    assert first.served_locally is False
+    assert second.served_locally is True
+    assert [a.agent_id for a in second.agents] == ["a", "b", "c"]
+    assert cache.stats.hits == 1
+    client.close()
+
+
+@respx.mock
+def test_narrower_search_served_locally():
+    """Narrower filters are evaluated over the cached broader result."""
+    route = respx.post(SEARCH_URL).mock(
+        return_value=respx.MockResponse(200, json=UNFILTERED)
+    )
+    cache = ResponseCache()
+    client = _client(cache)
+
+    client.search("fx", max_result=5)
+    kenya = client.search("fx", max_result=5, country="KE")
+    streaming = client.search(
+        "fx", max_result=5, country="KE", capability="streaming"
+    )
+
+    assert route.call_count == 1
+    assert kenya.served_locally is True
+    assert [a.agent_id for a in kenya.agents] == ["a", "c"]
+    assert [a.agent_id for a in streaming.agents] == ["a"]
+    assert cache.stats.local_hits == 2
+    client.close()
+
+
+@respx.mock
+def test_local_filtering_can_be_disabled():
+    """With local_filtering=False only exact hits are served."""
+    route = respx.post(SEARCH_URL).mock(
+        return_value=respx.MockResponse(200, json=UNFILTERED)
+    )
+    client = _client(ResponseCache(local_filtering=False))
+
+    client.search("fx", max_result=5)
+    response = client.search("fx", max_result=5, country="KE")
+
+    assert route.call_count == 2
+    assert response.served_locally is False
+    client.close()
+
+
+@respx.mock
+def test_prepared_search_uses_cache():
+    """Prepared searches share the client's cache."""
+    route = respx.post(SEARCH_URL).mock(
+        return_value=respx.MockResponse(200, json=UNFILTERED)
+    )
+    client = _client(ResponseCache())
+
+    client.search("fx", max_result=5)
+    response = client.prepare(country="KE")("fx", max_result=1)
+
+    assert route.call_count == 1
+    assert response.served_locally is True
+    assert [a.agent_id for a in response.agents] == ["a"]
+    client.close()
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_async_narrower_search_served_locally():
+    """Async client: narrower search is served locally (async parity)."""
+    route = respx.post(SEARCH_URL).mock(
+        return_value=respx.MockResponse(200, json=UNFILTERED)
+    )
+    config = ClientConfig(base_url="https://api.payelink.example", retries=0)
+    async with AsyncAgentSearchClient(api_key="test", cache=ResponseCache()) as client:
+        client._transport = AsyncTransport(config)
+
+        await client.search("fx", max_result=5)
+        response = await client.search("fx", max_result=5, country="NG")
+
+        assert route.call_count == 1
+        assert response.served_locally is True
+        assert [a.agent_id for a in response.agents] == ["b"]
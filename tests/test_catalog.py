@@ -0,0 +1,145 @@
+"""Tests for the memory-mapped agent catalog."""
+import pytest
+
+from payelink_agent_search import Catalog
+from payelink_agent_search.errors import CatalogError
+from payelink_agent_search.models import AgentDetails
+
+
+def _agents(count):
+    return [
+        AgentDetails(
+            agent_id=f"agent-{i:05d}",
+            agent_name=f"Agent {i}",
+            agent_description=None if i % 3 else f"Does task {i} — ünïcode",
+            agent_url=f"https://org{i % 7}.example.com/agents/{i}",
+            organization_name=f"Org {i % 7}",
+            organization_url=f"https://org{i % 7}.example.com",
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / "agents.cat"
+
+
+def test_build_and_open_round_trip(path):
+    """Agents are read back unchanged and in order."""
+    agents = _agents(50)
+    assert Catalog.build(agents, path) == 50
+
+    with Catalog.open(path) as catalog:
+        assert len(catalog) == 50
+        assert list(catalog) == agents
+
+
+def test_get_by_agent_id(path):
+    """Lookups use the sorted index."""
+    agents = list(reversed(_agents(200)))
+    Catalog.build(agents, path)
+
+    with Catalog.open(path) as catalog:
+        for agent in agents:
+            assert catalog.get(agent.agent_id) == agent
+        assert catalog.get("agent-99999") is None
+        assert catalog.get("") is None
+        assert "agent-00042" in catalog
+        assert "missing" not in catalog
+
+
+def test_strings_are_interned(path, tmp_path):
+    """Repeated organization names and URLs are stored once."""
+    Catalog.build(_agents(100), path)
+    distinct = tmp_path / "distinct.cat"
+    Catalog.build(
+        [
+            agent.model_copy(
+                update={
+                    "organization_name": f"Org {agent.agent_id}",
+                    "organization_url": f"https://{agent.agent_id}.example.com",
+                }
+            )
+            for agent in _agents(100)
+        ],
+        distinct,
+    )
+
+    assert path.stat().st_size < distinct.stat().st_size
+
+
+def test_build_accepts_dicts_and_missing_ids(path):
+    """Dicts are validated; agents without an id are iterated, not indexed."""
+    Catalog.build([{"agent_name": "Anonymous"}, {"agent_id": "a"}], path)
+
+    with Catalog.open(path) as catalog:
+        assert [agent.agent_name for agent in catalog] == ["Anonymous", None]
+        assert catalog.get("a") == AgentDetails(agent_id="a")
+
+
+def test_build_rejects_duplicate_ids(path):
+    """Two agents cannot share an agent_id."""
+    with pytest.raises(ValueError, match="Duplicate agent_id"):
+        Catalog.build([{"agent_id": "a"}, {"agent_id": "a"}], path)
+    assert not path.exists()
+
+
+def test_empty_catalog(path):
+    """A catalog may hold no agents."""
+    Catalog.build([], path)
+
+    with Catalog.open(path) as catalog:
+        assert len(catalog) == 0
+        assert list(catalog) == []
+        assert catalog.get("a") is None
+
+
+def test_open_detects_corruption(path):
+    """A changed byte fails the checksum unless verification is skipped."""
+    Catalog.build(_agents(10), path)
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 0xFF
+    path.write_bytes(bytes(data))
+
+    with pytest.raises(CatalogError, match="checksum"):
+        Catalog.open(path)
+    Catalog.open(path, verify=False).close()
+
+
+@pytest.mark.parametrize(
+    "content, reason",
+    [
+        (b"", "Invalid agent catalog"),
+        (b"PLAC", "too small"),
+        (b"JSON" + bytes(52), "not an agent catalog"),
+    ],
+)
+def test_open_rejects_invalid_files(path, content, reason):
+    """Files that are not catalogs raise CatalogError."""
+    path.write_bytes(content)
+
+    with pytest.raises(CatalogError, match=reason):
+        Catalog.open(path)
+
+
+def test_open_rejects_other_versions(path):
+    """Catalogs written by an incompatible version are rejected."""
+    Catalog.build(_agents(1), path)
+    data = bytearray(path.read_bytes())
+    data[4] = 99
+    path.write_bytes(bytes(data))
+
+    with pytest.raises(CatalogError, match="unsupported version 99"):
+        Catalog.open(path, verify=False)
+
+
+def test_rebuild_keeps_open_catalog_consistent(path):
+    """Rebuilding replaces the file without changing open mappings."""
+    Catalog.build(_agents(5), path)
+    with Catalog.open(path) as old:
+        Catalog.build(_agents(8), path)
+        assert len(old) == 5
+        assert old.get("agent-00004").agent_name == "Agent 4"
+        with Catalog.open(path) as new:
+            assert len(new) == 8
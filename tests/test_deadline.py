@@ -0,0 +1,232 @@
+"""Tests for deadline propagation across retries."""
+import asyncio
+import time
+
+import httpx
+import pytest
+import respx
+
+from payelink_agent_search import AgentSearchClient, AsyncAgentSearchClient
+from payelink_agent_search.config import ClientConfig
+from payelink_agent_search.deadline import (
+    Deadline,
+    current_deadline,
+    deadline_scope,
+    resolve_deadline,
+)
+from payelink_agent_search.errors import TimeoutError
+from payelink_agent_search.transport import AsyncTransport, Transport
+
+SEARCH_URL = "https://api.example.com/v1/agents/search"
+
+
+def test_deadline_remaining_and_expired():
+    """A deadline counts down and reports expiry."""
+    deadline = Deadline.after(10)
+    assert 9 < deadline.remaining() <= 10
+    assert not deadline.expired
+    assert Deadline.after(-1).expired
+    assert Deadline.after(-1).remaining() == 0.0
+
+
+def test_deadline_scope_nested_cannot_extend():
+    """Nested scopes inherit the outer deadline and can only tighten it."""
+    assert current_deadline() is None
+    with deadline_scope(1.0) as outer:
+        assert current_deadline() is outer
+        with deadline_scope(60.0) as inner:
+            assert inner is outer
+        with deadline_scope(0.1) as inner:
+            assert inner.expires_at < outer.expires_at
+        assert resolve_deadline(None) is outer
+    assert current_deadline() is None
+
+
+@respx.mock
+def test_attempt_timeout_capped_by_budget():
+    """Each attempt gets at most the remaining budget as its timeout."""
+    route = respx.post(SEARCH_URL).mock(
+        return_value=respx.MockResponse(200, json={"success": True, "data": []})
+    )
+    config = ClientConfig(base_url="https://api.example.com", retries=0)
+    transport = Transport(config)
+
+    transport.post_json(
+        "/v1/agents/search", {"query": "test"}, deadline=Deadline.after(0.5)
+    )
+
+    timeout = route.calls.last.request.extensions["timeout"]
+    assert 0 < timeout["read"] <= 0.5
+    transport.close()
+
+
+@respx.mock
+def test_expired_deadline_fails_without_request():
+    """An already expired deadline raises before anything is sent."""
+    route = respx.post(SEARCH_URL).mock(
+        return_value=respx.MockResponse(200, json={"success": True, "data": []})
+    )
+    config = ClientConfig(base_url="https://api.example.com", retries=2)
+    transport = Transport(config)
+
+    with pytest.raises(TimeoutError):
+        transport.post_json(
+            "/v1/agents/search", {"query": "test"}, deadline=Deadline.after(0)
+        )
+    assert route.call_count == 0
+    transport.close()
+
+
+@respx.mock
+def test_retries_stop_when_budget_runs_out():
+    """Retries stop as soon as the total budget is spent."""
+
+    def slow_timeout(request):
+        time.sleep(0.05)
+        raise httpx.ReadTimeout("timed out", request=request)
+
+    route = respx.post(SEARCH_URL).mock(side_effect=slow_timeout)
+    config = ClientConfig(base_url="https://api.example.com", retries=50)
+    client = AgentSearchClient(api_key="test")
+    client._transport = Transport(config)
+
+    started = time.monotonic()
+    with pytest.raises(TimeoutError):
+        client.search("test", timeout_budget=0.2)
+
+    assert time.monotonic() - started < 1.0
+    assert route.call_count < 51
+    client.close()
+
+
+@respx.mock
+def test_sync_search_fails_when_body_outlasts_budget():
+    """A response that trickles in past the budget raises TimeoutError."""
+
+    def trickle():
+        yield b'{"success": true, '
+        time.sleep(0.3)
+        yield b'"data": []}'
+
+    respx.post(SEARCH_URL).mock(
+        side_effect=lambda request: httpx.Response(200, content=trickle())
+    )
+    config = ClientConfig(base_url="https://api.example.com", retries=0)
+    client = AgentSearchClient(api_key="test")
+    client._transport = Transport(config)
+
+    with pytest.raises(TimeoutError, match="Deadline exceeded"):
+        client.search("test", timeout_budget=0.1)
+    client.close()
+
+
+@respx.mock
+def test_sync_search_fails_when_response_arrives_late():
+    """A response that completes after the budget is not returned."""
+
+    def slow(request):
+        time.sleep(0.15)
+        return httpx.Response(200, json={"success": True, "data": []})
+
+    respx.post(SEARCH_URL).mock(side_effect=slow)
+    config = ClientConfig(base_url="https://api.example.com", retries=0)
+    client = AgentSearchClient(api_key="test")
+    client._transport = Transport(config)
+
+    with pytest.raises(TimeoutError):
+        client.search("test", timeout_budget=0.1)
+    assert client.search("test", timeout_budget=1.0).success is True
+    client.close()
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_async_search_aborts_at_deadline():
+    """Async attempts are cancelled once the budget is exhausted."""
+
+    async def hang(request):
+        await asyncio.sleep(5)
+        return httpx.Response(200, json={"success": True, "data": []})
+
+    respx.post(SEARCH_URL).mock(side_effect=hang)
+    config = ClientConfig(base_url="https://api.example.com", retries=2)
+    async with AsyncAgentSearchClient(api_key="test") as client:
+        client._transport = AsyncTransport(config)
+
+        started = time.monotonic()
+        with pytest.raises(TimeoutError):
+            await client.search("test", timeout_budget=0.1)
+        assert time.monotonic() - started < 1.0
+
+
+@pytest.mark.asyncio
+async def test_async_cancelled_attempt_releases_pooled_connection():
+    """A cancelled attempt closes its connection and frees its pool slot."""
+    closed = asyncio.Event()
+    payload = b'{"success": true, "data": []}'
+
+    async def handle(reader, writer):
+        head = await reader.readuntil(b"\r\n\r\n")
+        length = next(
+            int(line.split(b":")[1])
+            for line in head.lower().split(b"\r\n")
+            if line.startswith(b"content-length:")
+        )
+        body = await reader.readexactly(length)
+        if b"slow" in body:
+            # Never answer; wait for the client to drop the connection.
+            await reader.read()
+            closed.set()
+        else:
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                b"Content-Length: %d\r\n\r\n%s" % (len(payload), payload)
+            )
+            await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    config = ClientConfig(base_url=f"http://127.0.0.1:{port}", retries=0)
+    # With a single pooled connection, a leaked slot would block the next
+    # request until the pool timeout.
+    pool = httpx.AsyncClient(
+        base_url=config.base_url,
+        limits=httpx.Limits(max_connections=1),
+        timeout=5.0,
+    )
+    try:
+        async with AsyncAgentSearchClient(api_key="test") as client:
+            client._transport = AsyncTransport(config, pool)
+
+            with pytest.raises(TimeoutError):
+                await client.search("slow", timeout_budget=0.2)
+            async with asyncio.timeout(1.0):
+                await closed.wait()
+                response = await client.search("fast")
+            assert response.success is True
+    finally:
+        server.close()
+        await server.wait_closed()
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_async_search_inherits_context_deadline():
+    """A deadline set by the caller's context applies to nested searches."""
+
+    async def hang(request):
+        await asyncio.sleep(5)
+        return httpx.Response(200, json={"success": True, "data": []})
+
+    respx.post(SEARCH_URL).mock(side_effect=hang)
+    config = ClientConfig(base_url="https://api.example.com", retries=0)
+    async with AsyncAgentSearchClient(api_key="test") as client:
+        client._transport = AsyncTransport(config)
+
+        async def nested():
+            return await client.search("test")
+
+        with deadline_scope(0.1):
+            with pytest.raises(TimeoutError):
+                await asyncio.create_task(nested())
@@ -0,0 +1,178 @@
+"""Tests for streaming export of search results."""
+import csv
+import gzip
+import io
+import json
+import sys
+
+import pytest
+
+from payelink_agent_search.export import (
+    COLUMNS,
+    ResultExporter,
+    aexport_results,
+    export_results,
+    flatten,
+)
+from payelink_agent_search.models import AgentDetails, SearchRequest, SearchResponse
+
+
+def _response(count, served_locally=False):
+    return SearchResponse(
+        success=True,
+        agents=[
+            AgentDetails(
+                agent_id=f"a{i}",
+                agent_name=f"Agent {i}",
+                organization_name="Acme",
+                organization_url="https://acme.com",
+            )
+            for i in range(count)
+        ],
+        served_locally=served_locally,
+    )
+
+
+RECORDS = [
+    (SearchRequest(query="Convert USD to KES"), _response(2), {"latency_ms": 12.5}),
+    (SearchRequest(query="Analyze a PPA"), _response(0, served_locally=True)),
+    (
+        SearchRequest(query="Book a flight"),
+        SearchResponse(success=False, error="boom"),
+        {"latency_ms": 3, "attempts": 2},
+    ),
+]
+
+
+def test_flatten_rows():
+    """Each agent becomes a row; empty and failed searches keep one row."""
+    rows = [row for record in RECORDS for row in flatten(*record)]
+    by_column = [dict(zip(COLUMNS, row)) for row in rows]
+
+    assert [row["query"] for row in by_column] == [
+        "Convert USD to KES",
+        "Convert USD to KES",
+        "Analyze a PPA",
+        "Book a flight",
+    ]
+    assert [row["rank"] for row in by_column] == [1, 2, None, None]
+    assert by_column[1]["agent_id"] == "a1"
+    assert by_column[1]["organization_name"] == "Acme"
+    assert by_column[0]["latency_ms"] == 12.5
+    assert by_column[0]["metadata"] is None
+    assert by_column[2]["served_locally"] is True
+    assert by_column[3]["error"] == "boom"
+    assert json.loads(by_column[3]["metadata"]) == {"attempts": 2}
+
+
+def test_export_ndjson(tmp_path):
+    """NDJSON exports hold one object per row."""
+    path = tmp_path / "results.ndjson"
+
+    assert export_results(RECORDS, path, batch_size=2) == 4
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line["agent_id"] for line in lines] == ["a0", "a1", None, None]
+    assert list(lines[0]) == list(COLUMNS)
+
+
+def test_export_csv_gzip(tmp_path):
+    """A .gz suffix selects gzip compression."""
+    path = tmp_path / "results.csv.gz"
+
+    export_results(RECORDS, path)
+
+    with gzip.open(path, "rt", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 4
+    assert rows[0]["query"] == "Convert USD to KES"
+    assert rows[0]["rank"] == "1"
+    assert rows[2]["agent_id"] == ""
+
+
+def test_export_to_file_object():
+    """A caller's file is written to but left open."""
+    buffer = io.BytesIO()
+
+    export_results(RECORDS, buffer, format="ndjson", compression="gzip")
+
+    assert not buffer.closed
+    lines = gzip.decompress(buffer.getvalue()).decode().splitlines()
+    assert len(lines) == 4
+
+
+def test_exporter_writes_fixed_size_batches(tmp_path):
+    """Rows are written once a batch is full, and the rest on close."""
+    exporter = ResultExporter(tmp_path / "results.jsonl", batch_size=3)
+    exporter.add(*RECORDS[0])
+    assert exporter.rows_written == 0
+    exporter.add(*RECORDS[1])
+    assert exporter.rows_written == 3
+    exporter.close()
+    assert exporter.rows_written == 3
+    exporter.close()
+
+
+@pytest.mark.parametrize(
+    "kwargs, message",
+    [
+        ({"target": "results.txt"}, "Cannot infer"),
+        ({"target": "results.csv", "format": "xml"}, "Unknown export format"),
+        ({"target": "results.csv", "compression": "zstd"}, "only support gzip"),
+        ({"target": "results.csv", "batch_size": 0}, "batch_size"),
+        ({"target": "results.parquet.gz"}, "only supported for ndjson and csv"),
+        ({"target": "results.arrow.gz"}, "only supported for ndjson and csv"),
+        (
+            {"target": "results.gz", "format": "parquet"},
+            "only supported for ndjson and csv",
+        ),
+    ],
+)
+def test_invalid_options(tmp_path, monkeypatch, kwargs, message):
+    """Invalid formats and options raise ValueError before writing."""
+    monkeypatch.chdir(tmp_path)
+
+    with pytest.raises(ValueError, match=message):
+        export_results(RECORDS, **kwargs)
+
+
+async def test_aexport_results(tmp_path):
+    """Async record streams are exported the same way (async parity)."""
+
+    async def records():
+        for record in RECORDS:
+            yield record
+
+    path = tmp_path / "results.ndjson"
+
+    assert await aexport_results(records(), path) == 4
+    assert len(path.read_text().splitlines()) == 4
+
+
+@pytest.mark.parametrize("suffix", [".arrow", ".parquet"])
+def test_export_arrow_formats(tmp_path, suffix):
+    """Arrow IPC and Parquet exports keep typed columns."""
+    pa = pytest.importorskip("pyarrow")
+    path = tmp_path / f"results{suffix}"
+
+    export_results(RECORDS, path, batch_size=2, compression="zstd")
+
+    if suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(path)
+    else:
+        with pa.ipc.open_file(path) as reader:
+            assert reader.num_record_batches == 2
+            table = reader.read_all()
+    assert table.column_names == list(COLUMNS)
+    assert table.column("rank").to_pylist() == [1, 2, None, None]
+    assert table.column("latency_ms").to_pylist() == [12.5, 12.5, None, 3.0]
+
+
+def test_arrow_formats_require_pyarrow(tmp_path, monkeypatch):
+    """A clear ImportError is raised when pyarrow is missing."""
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+
+    with pytest.raises(ImportError, match="pip install pyarrow"):
+        export_results(RECORDS, tmp_path / "results.parquet")
@@ -0,0 +1,159 @@
+"""Tests for the client-side filter engine."""
+from payelink_agent_search.filters import FilterEngine
+from payelink_agent_search.models import SearchRequest
+
+
+def _agent(agent_id, country=None, capabilities=None, input_modes=None):
+    agent = {"agent_id": agent_id, "agent_name": agent_id}
+    if country is not None:
+        agent["country"] = country
+    if capabilities is not None:
+        agent["capabilities"] = capabilities
+    if input_modes is not None:
+        agent["defaultInputModes"] = input_modes
+    return agent
+
+
+AGENTS = [
+    _agent("a", "KE", {"streaming": True}, ["text/plain"]),
+    _agent("b", "NG", {"streaming": True}, ["application/json"]),
+    _agent("c", "KE", {"streaming": False}, ["text/plain", "application/json"]),
+    _agent("d", "KE", {"streaming": True}, ["application/json"]),
+]
+
+
+def _ids(agents):
+    return [agent["agent_id"] for agent in agents]
+
+
+def test_narrower_filter_answered_in_rank_order():
+    """Adding a filter keeps the cached ranking of matching agents."""
+    cached = SearchRequest(query="fx", max_result=4)
+    request = SearchRequest(query="fx", max_result=2, country="KE")
+
+    answer = FilterEngine().answer(cached, AGENTS, request)
+    assert _ids(answer) == ["a", "c"]
+
+
+def test_stacked_filters_narrow_further():
+    """A cached filtered result can be narrowed with another filter."""
+    cached = SearchRequest(query="fx", max_result=4, country="KE")
+    request = SearchRequest(
+        query="fx", max_result=1, country="KE", capability="streaming"
+    )
+    kenyan = [agent for agent in AGENTS if agent["country"] == "KE"]
+
+    answer = FilterEngine().answer(cached, kenyan, request)
+    assert _ids(answer) == ["a"]
+
+
+def test_truncated_superset_without_enough_matches_misses():
+    """A truncated cached result cannot prove there are no more matches."""
+    cached = SearchRequest(query="fx", max_result=4)
+    request = SearchRequest(query="fx", max_result=4, country="KE")
+
+    assert FilterEngine().answer(cached, AGENTS, request) is None
+
+
+def test_exhaustive_superset_answers_with_fewer_matches():
+    """A result shorter than its max_result holds every match."""
+    cached = SearchRequest(query="fx", max_result=10)
+    request = SearchRequest(query="fx", max_result=5, country="NG")
+
+    answer = FilterEngine().answer(cached, AGENTS, request)
+    assert _ids(answer) == ["b"]
+
+
+def test_unknown_metadata_misses():
+    """Agents without the needed metadata force a round trip."""
+    cached = SearchRequest(query="fx", max_result=10)
+    request = SearchRequest(query="fx", max_result=5, country="KE")
+    agents = [_agent("a", "KE"), _agent("x")]
+
+    assert FilterEngine().answer(cached, agents, request) is None
+
+
+def test_country_name_and_code_are_not_compared():
+    """A country name is never judged against a country code."""
+    engine = FilterEngine()
+    request = SearchRequest(query="fx", country="Kenya")
+    assert engine.matches(_agent("a", "KE"), request) is None
+    assert engine.matches(_agent("a", "kenya"), request) is True
+    assert engine.matches(_agent("a", "Nigeria"), request) is None
+
+
+def test_only_alpha2_codes_decide_a_country_mismatch():
+    """Differing spellings other than two alpha-2 codes go to the API."""
+    engine = FilterEngine()
+    usa = SearchRequest(query="fx", country="USA")
+    kenya = SearchRequest(query="fx", country="Kenya")
+
+    assert engine.matches(_agent("a", "United States"), usa) is None
+    assert engine.matches(_agent("a", "Republic of Kenya"), kenya) is None
+    code = SearchRequest(query="fx", country="ke")
+    assert engine.matches(_agent("a", "NG"), code) is False
+
+    cached = SearchRequest(query="fx", max_result=10)
+    agents = [_agent("a", "United States")]
+    request = SearchRequest(query="fx", max_result=5, country="USA")
+    assert engine.answer(cached, agents, request) is None
+
+
+def test_partial_mode_overlap_is_undecided():
+    """Multi-mode filters only decide when all or none of the modes match."""
+    engine = FilterEngine()
+    request = SearchRequest(
+        query="fx", default_input_mode=["text/plain", "application/json"]
+    )
+    assert engine.matches(AGENTS[2], request) is True
+    assert engine.matches(AGENTS[0], request) is None
+    assert engine.matches(_agent("x", input_modes=["text/markdown"]), request) is False
+
+
+def test_different_query_or_scope_is_not_a_superset():
+    """Only the same query and allowed_url can be reused."""
+    engine = FilterEngine()
+    cached = SearchRequest(query="fx", max_result=10)
+    assert engine.answer(cached, AGENTS, SearchRequest(query="tax")) is None
+    assert (
+        engine.answer(
+            cached,
+            AGENTS,
+            SearchRequest(query="fx", allowed_url=["https://org.example.com"]),
+        )
+        is None
+    )
+
+
+def test_conflicting_filters_are_not_a_superset():
+    """A cached filter that differs from the new one cannot be reused."""
+    cached = SearchRequest(query="fx", max_result=10, country="NG")
+    request = SearchRequest(query="fx", max_result=1, country="KE")
+    assert FilterEngine().answer(cached, AGENTS, request) is None
+
+
+def test_unbounded_cached_result_is_never_complete():
+    """A result sent without max_result may be cut at the API's default."""
+    engine = FilterEngine()
+    cached = SearchRequest(query="fx", max_result=None)
+
+    request = SearchRequest(query="fx", max_result=5)
+    assert engine.answer(cached, AGENTS[:2], request) is None
+    answer = engine.answer(
+        cached, AGENTS, SearchRequest(query="fx", max_result=1, country="KE")
+    )
+    assert _ids(answer) == ["a"]
+
+
+def test_unbounded_request_needs_unbounded_cached_result():
+    """A request without max_result is only answered by the same search."""
+    engine = FilterEngine()
+    request = SearchRequest(query="fx", max_result=None)
+
+    bounded = SearchRequest(query="fx", max_result=10)
+    unbounded = SearchRequest(query="fx", max_result=None)
+    narrower = SearchRequest(query="fx", max_result=None, country="KE")
+
+    assert engine.answer(bounded, AGENTS, request) is None
+    assert _ids(engine.answer(unbounded, AGENTS, request)) == _ids(AGENTS)
+    assert engine.answer(unbounded, AGENTS, narrower) is None
@@ -0,0 +1,110 @@
+"""Tests for import-time cost and lazy loading of the package."""
+import subprocess
+import sys
+from typing import Dict
+
+import pytest
+
+import payelink_agent_search
+
+# Generous ceiling for ``import payelink_agent_search`` (in microseconds); the
+# package itself should only load ``_version`` at import time.
+IMPORT_BUDGET_US = 50_000
+
+
+def _importtime(statement: str) -> Dict[str, int]:
+    """Run ``statement`` with ``-X importtime`` and return cumulative times."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.split("|")
+        timings[module.strip()] = int(cumulative)
+    return timings
+
+
+def test_package_import_within_budget():
+    """Importing the package stays within the import-time budget."""
+    timings = _importtime("import payelink_agent_search")
+    assert timings["payelink_agent_search"] < IMPORT_BUDGET_US
+
+
+def test_package_import_skips_heavy_dependencies():
+    """Importing the package does not load httpx or pydantic."""
+    timings = _importtime("import payelink_agent_search")
+    assert "httpx" not in timings
+    assert "pydantic" not in timings
+    assert "payelink_agent_search.client" not in timings
+
+
+def test_models_import_skips_httpx():
+    """Code that only needs the models never loads the transport."""
+    statement = (
+        "import sys; from payelink_agent_search import SearchRequest; "
+        "print('payelink_agent_search.models' in sys.modules, "
+        "'httpx' in sys.modules, "
+        "'payelink_agent_search.transport' in sys.modules)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.split() == ["True", "False", "False"]
+
+
+def test_sync_client_skips_asyncio():
+    """Building and using the sync client never loads the async stack."""
+    statement = """
+import sys
+import httpx
+from payelink_agent_search import AgentSearchClient
+from payelink_agent_search.transport import Transport
+
+print('asyncio' in sys.modules)
+client = AgentSearchClient(api_key="test")
+print('asyncio' in sys.modules)
+
+def handler(request):
+    return httpx.Response(200, json={"success": True, "data": []})
+
+client._transport = Transport(
+    client._config,
+    httpx.Client(
+        base_url=client._config.base_url,
+        transport=httpx.MockTransport(handler),
+    ),
+)
+client.search("test", timeout_budget=5.0)
+print('asyncio' in sys.modules)
+"""
+    result = subprocess.run(
+        [sys.executable, "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.split() == ["False", "False", "False"]
+
+
+def test_lazy_attributes_resolve():
+    """Top-level names resolve to the objects defined in their modules."""
+    from payelink_agent_search.client import AgentSearchClient
+    from payelink_agent_search.models import SearchResponse
+
+    assert payelink_agent_search.AgentSearchClient is AgentSearchClient
+    assert payelink_agent_search.SearchResponse is SearchResponse
+    assert set(payelink_agent_search.__all__) <= set(dir(payelink_agent_search))
+
+
+def test_unknown_attribute_raises():
+    """Unknown top-level names raise AttributeError."""
+    with pytest.raises(AttributeError, match="DoesNotExist"):
+        payelink_agent_search.DoesNotExist
@@ -0,0 +1,115 @@
+"""Tests for prepared search templates."""
+import json
+
+import pytest
+import respx
+from pydantic import ValidationError
+
+from payelink_agent_search import AgentSearchClient, AsyncAgentSearchClient
+from payelink_agent_search.config import ClientConfig
+from payelink_agent_search.models import SearchRequest
+from payelink_agent_search.prepared import SearchTemplate
+from payelink_agent_search.transport import AsyncTransport, Transport
+
+SEARCH_URL = "https://api.payelink.example/v1/agents/search"
+
+FILTERS = {
+    "country": "KE",
+    "capability": "streaming",
+    "default_input_mode": ["text/plain"],
+    "default_output_mode": ["application/json"],
+    "allowed_url": [f"https://org{i}.example.com" for i in range(200)],
+}
+
+
+def test_template_matches_search_request_payload():
+    """The encoded body equals the payload search() would send."""
+    template = SearchTemplate(**FILTERS)
+    body = json.loads(template.encode("Convert USD → KES", max_result=5))
+
+    expected = SearchRequest(
+        query="Convert USD → KES", max_result=5, **FILTERS
+    ).model_dump(exclude_none=True)
+    assert body == expected
+    assert list(body) == list(expected)
+
+
+def test_template_without_filters():
+    """A template with no filters encodes just query and max_result."""
+    template = SearchTemplate()
+    assert json.loads(template.encode('say "hi"')) == {"query": 'say "hi"'}
+    assert json.loads(template.encode("x", max_result=3)) == {
+        "query": "x",
+        "max_result": 3,
+    }
+
+
+def test_template_default_max_result():
+    """max_result given to the template is used unless overridden per call."""
+    template = SearchTemplate(max_result=4, country="KE")
+    assert json.loads(template.encode("x"))["max_result"] == 4
+    assert json.loads(template.encode("x", max_result=1))["max_result"] == 1
+
+
+def test_template_validates_filters_once():
+    """Invalid filters fail when the template is built."""
+    with pytest.raises(ValidationError):
+        SearchTemplate(default_input_mode=["audio/wav"])
+
+
+def test_template_rejects_bad_query_types():
+    """Per-call values are type-checked without pydantic."""
+    template = SearchTemplate(country="KE")
+    with pytest.raises(TypeError):
+        template.encode(123)
+    with pytest.raises(TypeError):
+        template.encode("x", max_result="5")
+    with pytest.raises(TypeError):
+        template.encode("x", max_result=True)
+
+
+@respx.mock
+def test_prepared_search_sends_encoded_body(sample_search_response):
+    """The prepared callable posts the pre-encoded body and parses agents."""
+    route = respx.post(SEARCH_URL).mock(
+        return_value=respx.MockResponse(200, json=sample_search_response)
+    )
+    config = ClientConfig(base_url="https://api.payelink.example", retries=1)
+    client = AgentSearchClient(api_key="test")
+    client._transport = Transport(config)
+
+    search = client.prepare(country="KE", allowed_url=["https://org.example.com"])
+    response = search("finance", max_result=5)
+
+    request = route.calls.last.request
+    assert request.headers["Content-Type"] == "application/json"
+    assert json.loads(request.content) == {
+        "query": "finance",
+        "max_result": 5,
+        "country": "KE",
+        "allowed_url": ["https://org.example.com"],
+    }
+    assert response.success is True
+    assert len(response.agents) == 2
+    client.close()
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_async_prepared_search(sample_search_response):
+    """Async client: prepared callable is awaitable (async parity)."""
+    route = respx.post(SEARCH_URL).mock(
+        return_value=respx.MockResponse(200, json=sample_search_response)
+    )
+    config = ClientConfig(base_url="https://api.payelink.example", retries=1)
+    async with AsyncAgentSearchClient(api_key="test") as client:
+        client._transport = AsyncTransport(config)
+
+        search = client.prepare(country="KE")
+        response = await search("translation agent")
+
+        assert json.loads(route.calls.last.request.content) == {
+            "query": "translation agent",
+            "country": "KE",
+        }
+        assert len(response.agents) == 2
@@ -0,0 +1,156 @@
+"""Tests for the streaming agents.json registry parser."""
+import json
+from pathlib import Path
+
+import pytest
+import respx
+
+from payelink_agent_search import AgentSearchClient, AsyncAgentSearchClient
+from payelink_agent_search.config import ClientConfig
+from payelink_agent_search.errors import (
+    HttpStatusError,
+    InvalidResponseError,
+    LimitExceededError,
+)
+from payelink_agent_search.models import RegistryAgent, RegistryOrganization
+from payelink_agent_search.registry import RegistryParser, iter_registry
+from payelink_agent_search.transport import AsyncTransport, Transport
+
+EXAMPLE = (Path(__file__).parent.parent / "examples" / "agents.json").read_bytes()
+REGISTRY_URL = "https://acme.com/.well-known/agents.json"
+
+
+def _chunks(data, size):
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+def _registry(count):
+    return json.dumps(
+        {
+            "organization": {"name": "Acme Finance Ltd", "url": "https://acme.com"},
+            "version": 12345,
+            "agents": [
+                {"id": f"agent-{i}", "card": f"https://acme.com/agents/{i}.json"}
+                for i in range(count)
+            ],
+        }
+    ).encode()
+
+
+@pytest.mark.parametrize("size", [1, 2, 7, 64, len(EXAMPLE)])
+def test_parses_example_registry_in_any_chunking(size):
+    """The example registry parses identically however it is chunked."""
+    entries = list(iter_registry(_chunks(EXAMPLE, size)))
+
+    assert entries[0] == RegistryOrganization(
+        name="Acme Finance Ltd", url="https://acme.com"
+    )
+    assert [entry.id for entry in entries[1:]] == [
+        "budget-planner",
+        "currency-converter",
+    ]
+    assert all(isinstance(entry, RegistryAgent) for entry in entries[1:])
+
+
+def test_entries_are_emitted_before_the_document_ends():
+    """Agents are returned as soon as their entry is complete."""
+    data = _registry(3)
+    parser = RegistryParser()
+    cut = data.index(b'"agent-1"')
+
+    first = parser.feed(data[:cut])
+    assert [type(entry) for entry in first] == [RegistryOrganization, RegistryAgent]
+    rest = parser.feed(data[cut:]) + parser.close()
+    assert [entry.id for entry in rest] == ["agent-1", "agent-2"]
+
+
+def test_numbers_split_across_chunks_are_not_truncated():
+    """Unrelated top-level values split across chunks are skipped intact."""
+    data = _registry(1)
+    cut = data.index(b"12345") + 2
+    entries = list(iter_registry([data[:cut], data[cut:]]))
+    assert len(entries) == 2
+
+
+def test_max_bytes_enforced():
+    """Documents larger than max_bytes are rejected while streaming."""
+    with pytest.raises(LimitExceededError):
+        list(iter_registry(_chunks(_registry(100), 64), max_bytes=512))
+
+
+def test_max_agents_enforced():
+    """Registries with too many agents are rejected."""
+    with pytest.raises(LimitExceededError):
+        list(iter_registry([_registry(5)], max_agents=4))
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        b'["not", "an", "object"]',
+        b'{"organization": {"name": "Acme"}}',
+        b'{"agents": [{"id": "x"}]}',
+        b'{"agents": ["x"]}',
+        b'{"agents": [}',
+        b'{"agents": []',
+        b'{"agents": []} trailing',
+        b'{"agents": [{"id": "\xff", "card": "x"}]}',
+    ],
+)
+def test_malformed_registries_raise(body):
+    """Malformed registries raise InvalidResponseError."""
+    with pytest.raises(InvalidResponseError):
+        list(iter_registry(_chunks(body, 3)))
+
+
+def _client(api_key="secret"):
+    config = ClientConfig(base_url="https://api.payelink.example", api_key=api_key)
+    client = AgentSearchClient(api_key=api_key)
+    client._transport = Transport(config)
+    return client
+
+
+@respx.mock
+def test_client_streams_registry_without_api_key():
+    """The sync client streams a registry and never sends the API key."""
+    route = respx.get(REGISTRY_URL).mock(
+        return_value=respx.MockResponse(200, content=EXAMPLE)
+    )
+    client = _client()
+
+    entries = list(client.iter_registry("https://acme.com/"))
+
+    assert len(entries) == 3
+    assert "Authorization" not in route.calls.last.request.headers
+    client.close()
+
+
+@respx.mock
+def test_client_registry_http_error():
+    """HTTP errors from the registry host raise HttpStatusError."""
+    respx.get(REGISTRY_URL).mock(return_value=respx.MockResponse(404, text="nope"))
+    client = _client()
+
+    with pytest.raises(HttpStatusError) as exc_info:
+        list(client.iter_registry("https://acme.com"))
+    assert exc_info.value.status_code == 404
+    client.close()
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_async_client_streams_registry():
+    """Async client: registry entries stream in order (async parity)."""
+    respx.get(REGISTRY_URL).mock(
+        return_value=respx.MockResponse(200, content=_registry(50))
+    )
+    config = ClientConfig(base_url="https://api.payelink.example")
+    async with AsyncAgentSearchClient(api_key="test") as client:
+        client._transport = AsyncTransport(config)
+
+        entries = [entry async for entry in client.iter_registry("https://acme.com")]
+
+        assert isinstance(entries[0], RegistryOrganization)
+        assert [entry.id for entry in entries[1:]] == [
+            f"agent-{i}" for i in range(50)
+        ]
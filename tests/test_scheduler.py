@@ -0,0 +1,224 @@
+"""Tests for the adaptive registry refresh schedulers."""
+import asyncio
+import threading
+import time
+
+import pytest
+import respx
+
+from payelink_agent_search import AgentSearchClient, AsyncAgentSearchClient
+from payelink_agent_search.config import ClientConfig
+from payelink_agent_search.models import RegistryAgent, RegistryOrganization
+from payelink_agent_search.scheduler import (
+    AsyncRefreshScheduler,
+    RefreshPolicy,
+    RefreshScheduler,
+    RegistrySnapshot,
+    _Schedule,
+)
+from payelink_agent_search.transport import AsyncTransport, Transport
+
+FAST = RefreshPolicy(
+    min_interval=0.01,
+    max_interval=0.05,
+    initial_interval=0.02,
+    jitter=0.0,
+    initial_spread=0.0,
+    max_workers=2,
+)
+
+
+def _snapshot(url, version):
+    return RegistrySnapshot.from_entries(
+        url,
+        [
+            RegistryOrganization(name="Acme", url=url),
+            RegistryAgent(id=f"agent-v{version}", card=f"{url}/card.json"),
+        ],
+    )
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.005)
+
+
+def test_snapshot_digest_tracks_content():
+    """Snapshots of identical registries share a digest."""
+    url = "https://acme.com"
+    assert _snapshot(url, 1).digest == _snapshot(url, 1).digest
+    assert _snapshot(url, 1).digest != _snapshot(url, 2).digest
+    assert _snapshot(url, 1).agents[0].id == "agent-v1"
+
+
+def test_schedule_backs_off_and_tightens_within_bounds():
+    """Unchanged polls lengthen the interval; changes shorten it."""
+    policy = RefreshPolicy(
+        min_interval=10,
+        max_interval=100,
+        initial_interval=40,
+        jitter=0,
+        initial_spread=0,
+    )
+    schedule = _Schedule(policy)
+    url = "https://acme.com"
+    schedule.add(url)
+
+    def poll(version):
+        assert schedule.pop_due(time.monotonic() + 1000) == url
+        schedule.record(url, _snapshot(url, version))
+        return schedule.status()[0]
+
+    assert poll(1).interval == 40  # first poll sets the baseline
+    assert poll(1).interval == 60
+    assert poll(1).interval == 90
+    assert poll(1).interval == 100  # capped at max_interval
+    status = poll(2)
+    assert status.interval == 50
+    assert status.changes == 1
+    assert poll(3).interval == 25
+    assert poll(4).interval == 12.5
+    assert poll(5).interval == 10  # floored at min_interval
+    assert schedule.snapshot(url).agents[0].id == "agent-v5"
+
+
+def test_schedule_records_failures_without_adapting():
+    """Failed polls are counted and keep the current interval."""
+    schedule = _Schedule(RefreshPolicy(jitter=0, initial_spread=0))
+    schedule.add("https://acme.com")
+    schedule.pop_due(time.monotonic())
+    schedule.record("https://acme.com", None, RuntimeError("boom"))
+
+    status = schedule.status()[0]
+    assert status.failures == 1
+    assert status.last_error == "boom"
+    assert status.interval == 3600.0
+    assert status.last_refreshed_at is None
+
+
+def test_schedule_reports_lag_and_next_refresh():
+    """Overdue registries report lag; next refresh times are wall-clock."""
+    schedule = _Schedule(RefreshPolicy(initial_spread=0))
+    schedule.add("https://acme.com")
+    time.sleep(0.02)
+
+    status = schedule.status()[0]
+    assert status.lag >= 0.02
+    assert status.next_refresh_at <= time.time()
+
+
+def test_invalid_policy_rejected():
+    """Inconsistent bounds are rejected."""
+    with pytest.raises(ValueError):
+        RefreshPolicy(min_interval=10, max_interval=5)
+
+
+def test_thread_scheduler_refreshes_with_bounded_workers():
+    """The threaded scheduler polls all registries with bounded concurrency."""
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+    calls = {}
+
+    def fetch(url):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+            calls[url] = calls.get(url, 0) + 1
+        time.sleep(0.005)
+        with lock:
+            active -= 1
+        return _snapshot(url, calls[url] // 2)
+
+    urls = [f"https://org{i}.example.com" for i in range(5)]
+    scheduler = RefreshScheduler(fetch, FAST)
+    scheduler.start()
+    for url in urls:
+        scheduler.add(url)
+
+    _wait_for(lambda: all(calls.get(url, 0) >= 3 for url in urls))
+    scheduler.stop()
+
+    assert peak <= FAST.max_workers
+    assert all(scheduler.snapshot(url) is not None for url in urls)
+    assert {status.organization_url for status in scheduler.status()} == set(urls)
+
+    stopped_calls = dict(calls)
+    time.sleep(0.1)
+    assert calls == stopped_calls
+
+
+@pytest.mark.asyncio
+async def test_async_scheduler_refreshes_and_stops():
+    """The asyncio scheduler polls registries and cancels on stop."""
+    calls = {}
+
+    async def fetch(url):
+        calls[url] = calls.get(url, 0) + 1
+        await asyncio.sleep(0.001)
+        return _snapshot(url, 1)
+
+    scheduler = AsyncRefreshScheduler(fetch, FAST)
+    scheduler.start()
+    scheduler.add("https://acme.com")
+
+    for _ in range(500):
+        if calls.get("https://acme.com", 0) >= 5:
+            break
+        await asyncio.sleep(0.01)
+    await scheduler.stop()
+
+    assert calls["https://acme.com"] >= 5
+    status = scheduler.status()[0]
+    assert status.interval == FAST.max_interval  # never changed, backed off
+    assert scheduler.snapshot("https://acme.com").organization.name == "Acme"
+
+
+REGISTRY = {
+    "organization": {"name": "Acme Finance Ltd", "url": "https://acme.com"},
+    "agents": [{"id": "budget-planner", "card": "https://acme.com/b.json"}],
+}
+
+
+@respx.mock
+def test_client_watch_registries_stops_on_close():
+    """The client owns its scheduler and stops it on close."""
+    route = respx.get("https://acme.com/.well-known/agents.json").mock(
+        return_value=respx.MockResponse(200, json=REGISTRY)
+    )
+    client = AgentSearchClient(api_key="test")
+    client._transport = Transport(ClientConfig())
+
+    scheduler = client.watch_registries(["https://acme.com"], FAST)
+    assert client.watch_registries(["https://acme.com"]) is scheduler
+    _wait_for(lambda: scheduler.snapshot("https://acme.com") is not None)
+    client.close()
+
+    calls = route.call_count
+    time.sleep(0.1)
+    assert route.call_count == calls
+    assert scheduler.snapshot("https://acme.com").agents[0].id == "budget-planner"
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_async_client_watch_registries():
+    """Async client: registries refresh in tasks (async parity)."""
+    respx.get("https://acme.com/.well-known/agents.json").mock(
+        return_value=respx.MockResponse(200, json=REGISTRY)
+    )
+    async with AsyncAgentSearchClient(api_key="test") as client:
+        client._transport = AsyncTransport(ClientConfig())
+
+        scheduler = client.watch_registries(["https://acme.com"], FAST)
+        for _ in range(500):
+            if scheduler.snapshot("https://acme.com") is not None:
+                break
+            await asyncio.sleep(0.01)
+
+        snapshot = scheduler.snapshot("https://acme.com")
+        assert snapshot.organization.name == "Acme Finance Ltd"
+    assert client._scheduler is None
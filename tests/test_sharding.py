@@ -0,0 +1,209 @@
+"""Tests for sharded fan-out of long allowed_url lists."""
+import json
+
+import httpx
+import pytest
+import respx
+
+from payelink_agent_search import (
+    AgentSearchClient,
+    AsyncAgentSearchClient,
+    ResponseCache,
+    ShardPolicy,
+)
+from payelink_agent_search.config import ClientConfig
+from payelink_agent_search.errors import HttpStatusError, SdkError
+from payelink_agent_search.models import SearchRequest
+from payelink_agent_search.sharding import DEFAULT_MAX_RESULT, merge_shard_results
+from payelink_agent_search.transport import AsyncTransport, Transport
+
+SEARCH_URL = "https://api.payelink.example/v1/agents/search"
+URLS = [f"https://org{i}.example.com" for i in range(5)]
+
+
+def _agent(url, name, score=None):
+    agent = {"agent_id": f"{url}#{name}", "organization_url": url}
+    if score is not None:
+        agent["score"] = score
+    return agent
+
+
+def _result(*agents):
+    return {"success": True, "data": list(agents)}
+
+
+def _shards(count):
+    return [SearchRequest(query="fx", allowed_url=[URLS[i]]) for i in range(count)]
+
+
+def test_split_chunks_allowed_url():
+    """Long allowed_url lists are split into shard_size chunks."""
+    request = SearchRequest(query="fx", max_result=3, allowed_url=URLS)
+    shards = ShardPolicy(shard_size=2).split(request)
+
+    assert [shard.allowed_url for shard in shards] == [
+        URLS[0:2],
+        URLS[2:4],
+        URLS[4:5],
+    ]
+    assert all(shard.max_result == 3 for shard in shards)
+    assert ShardPolicy(shard_size=5).split(request) is None
+    assert ShardPolicy().split(SearchRequest(query="fx")) is None
+
+
+def test_split_sets_default_limit_on_every_shard():
+    """Shards of an unbounded search all carry the limit used to merge."""
+    request = SearchRequest(query="fx", max_result=None, allowed_url=URLS)
+    shards = ShardPolicy(shard_size=2).split(request)
+
+    assert all(shard.max_result == DEFAULT_MAX_RESULT for shard in shards)
+    results = [
+        {"success": True, "data": [{"agent_id": f"{i}-{j}"} for j in range(3)]}
+        for i in range(len(shards))
+    ]
+    merged = merge_shard_results(shards, results, None, "raise")
+    assert len(merged["data"]) == DEFAULT_MAX_RESULT
+
+
+def test_invalid_policy_rejected():
+    """Non-positive sizes are rejected."""
+    with pytest.raises(ValueError):
+        ShardPolicy(shard_size=0)
+    with pytest.raises(ValueError):
+        ShardPolicy(max_concurrency=0)
+
+
+def test_merge_interleaves_by_rank_and_deduplicates():
+    """Without scores, shard results interleave by rank."""
+    duplicate = _agent("x", "dup")
+    results = [
+        _result(_agent("a", "1"), duplicate, _agent("a", "3")),
+        _result(duplicate, _agent("b", "2")),
+    ]
+
+    merged = merge_shard_results(_shards(2), results, 3, "raise")
+
+    assert [agent["agent_id"] for agent in merged["data"]] == [
+        "a#1",
+        "x#dup",
+        "b#2",
+    ]
+    assert merged["shard_errors"] == []
+
+
+def test_merge_uses_scores_when_present():
+    """When every agent has a score, the highest scores win."""
+    results = [
+        _result(_agent("a", "1", 0.5), _agent("a", "2", 0.4)),
+        _result(_agent("b", "1", 0.9), _agent("b", "2", 0.45)),
+    ]
+
+    merged = merge_shard_results(_shards(2), results, 3, "raise")
+
+    assert [agent["agent_id"] for agent in merged["data"]] == [
+        "b#1",
+        "a#1",
+        "b#2",
+    ]
+
+
+def test_merge_partial_reports_shard_errors():
+    """With on_error='partial', failed shards are reported, not raised."""
+    results = [_result(_agent("a", "1")), HttpStatusError(502, "bad gateway")]
+
+    merged = merge_shard_results(_shards(2), results, 2, "partial")
+
+    assert [agent["agent_id"] for agent in merged["data"]] == ["a#1"]
+    assert merged["shard_errors"] == [
+        {"shard": 1, "allowed_url": [URLS[1]], "error": "bad gateway"}
+    ]
+
+
+def test_merge_raise_policy_raises_shard_error():
+    """With on_error='raise', the shard's error is raised."""
+    results = [_result(), HttpStatusError(502, "bad gateway")]
+    with pytest.raises(HttpStatusError):
+        merge_shard_results(_shards(2), results, 2, "raise")
+
+
+def test_merge_all_failed_raises():
+    """A search fails when every shard fails, even in partial mode."""
+    results = [HttpStatusError(502, "bad"), {"success": False, "error": "boom"}]
+    with pytest.raises(SdkError):
+        merge_shard_results(_shards(2), results, 2, "partial")
+
+
+def _shard_response(request):
+    urls = json.loads(request.content)["allowed_url"]
+    if URLS[4] in urls:
+        return httpx.Response(503, text="unavailable")
+    return httpx.Response(
+        200, json=_result(*(_agent(url, "agent") for url in urls))
+    )
+
+
+@respx.mock
+def test_client_fans_out_and_merges():
+    """The sync client issues one request per shard and merges them."""
+    route = respx.post(SEARCH_URL).mock(side_effect=_shard_response)
+    config = ClientConfig(base_url="https://api.payelink.example", retries=0)
+    client = AgentSearchClient(
+        api_key="test",
+        cache=ResponseCache(),
+        sharding=ShardPolicy(shard_size=2, on_error="partial"),
+    )
+    client._transport = Transport(config)
+
+    response = client.search("fx", max_result=3, allowed_url=URLS)
+
+    assert route.call_count == 3
+    assert [agent.organization_url for agent in response.agents] == [
+        URLS[0],
+        URLS[2],
+        URLS[1],
+    ]
+    assert response.shard_errors[0].shard == 2
+    assert response.shard_errors[0].allowed_url == [URLS[4]]
+
+    # Partial results are not cached.
+    client.search("fx", max_result=3, allowed_url=URLS)
+    assert route.call_count == 6
+    client.close()
+
+
+@respx.mock
+def test_client_prepared_search_is_sharded():
+    """Prepared searches with long allowed_url lists are sharded too."""
+    route = respx.post(SEARCH_URL).mock(side_effect=_shard_response)
+    config = ClientConfig(base_url="https://api.payelink.example", retries=0)
+    client = AgentSearchClient(api_key="test", sharding=ShardPolicy(shard_size=2))
+    client._transport = Transport(config)
+
+    search = client.prepare(allowed_url=URLS[:4])
+    response = search("fx", max_result=4)
+
+    assert route.call_count == 2
+    assert len(response.agents) == 4
+    client.close()
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_async_client_fans_out_and_raises():
+    """Async client: shards run concurrently; failures raise by default."""
+    route = respx.post(SEARCH_URL).mock(side_effect=_shard_response)
+    config = ClientConfig(base_url="https://api.payelink.example", retries=0)
+    async with AsyncAgentSearchClient(
+        api_key="test", sharding=ShardPolicy(shard_size=2, max_concurrency=2)
+    ) as client:
+        client._transport = AsyncTransport(config)
+
+        response = await client.search("fx", max_result=2, allowed_url=URLS[:4])
+        assert route.call_count == 2
+        assert [agent.organization_url for agent in response.agents] == [
+            URLS[0],
+            URLS[2],
+        ]
+
+        with pytest.raises(HttpStatusError):
+            await client.search("fx", allowed_url=URLS)
@@ -0,0 +1,197 @@
+"""Tests for cache warm-up from a query log."""
+import json
+import time
+
+import httpx
+import pytest
+import respx
+
+from payelink_agent_search import (
+    AgentSearchClient,
+    AsyncAgentSearchClient,
+    ResponseCache,
+)
+from payelink_agent_search.config import ClientConfig
+from payelink_agent_search.deadline import deadline_scope
+from payelink_agent_search.transport import AsyncTransport, Transport
+from payelink_agent_search.warmup import load_hot_set, main
+
+SEARCH_URL = "https://api.payelink.example/v1/agents/search"
+RESULT = {"success": True, "data": [{"agent_id": "a"}], "message": "Found 1"}
+
+LOG = [
+    {"query": "Convert USD to KES"},
+    {"query": "Convert  USD to KES "},
+    {"query": "Analyze a PPA", "country": "KE"},
+    "not json",
+    {"max_result": 3},
+    {"query": "Book a flight", "count": 5},
+    {"query": "Convert USD to KES"},
+]
+
+
+def _client(cache):
+    config = ClientConfig(base_url="https://api.payelink.example", retries=0)
+    client = AgentSearchClient(api_key="test", cache=cache)
+    client._transport = Transport(config)
+    return client
+
+
+def test_load_hot_set_ranks_distinct_requests():
+    """Requests are deduplicated, weighted by count and ranked."""
+    requests, skipped = load_hot_set(LOG, top_n=2)
+
+    assert [request.query for request in requests] == [
+        "Book a flight",
+        "Convert USD to KES",
+    ]
+    assert skipped == 2
+
+
+def test_load_hot_set_reads_jsonl_file(tmp_path):
+    """A JSONL path is read line by line; blank lines are ignored."""
+    path = tmp_path / "log.jsonl"
+    path.write_text('{"query": "a"}\n\n{"query": "b", "frequency": 2}\n')
+
+    requests, skipped = load_hot_set(path)
+    assert [request.query for request in requests] == ["b", "a"]
+    assert skipped == 0
+
+
+@respx.mock
+def test_warm_populates_cache_with_progress():
+    """Warm-up fills the cache so later searches are served locally."""
+    route = respx.post(SEARCH_URL).mock(
+        return_value=respx.MockResponse(200, json=RESULT)
+    )
+    client = _client(ResponseCache())
+    updates = []
+
+    report = client.warm(LOG, concurrency=2, rate=None, progress=updates.append)
+
+    assert route.call_count == 3
+    assert report.total == 3
+    assert report.warmed == 3
+    assert report.coverage == 1.0
+    assert report.completed is True
+    assert len(updates) == 3
+    assert client.search("Analyze a PPA", country="KE").served_locally is True
+
+    again = client.warm(LOG, rate=None)
+    assert again.already_cached == 3
+    assert route.call_count == 3
+    client.close()
+
+
+@respx.mock
+def test_warm_uses_live_request_body_and_cache_key():
+    """Warmed entries are exact hits for live searches without max_result."""
+    route = respx.post(SEARCH_URL).mock(
+        return_value=respx.MockResponse(200, json=RESULT)
+    )
+    client = _client(ResponseCache(local_filtering=False))
+
+    client.warm([{"query": "Book a flight"}], rate=None)
+
+    assert json.loads(route.calls.last.request.content) == {"query": "Book a flight"}
+    assert client.search("Book a flight").served_locally is True
+    assert route.call_count == 1
+    client.close()
+
+
+@respx.mock
+def test_warm_applies_surrounding_deadline_scope():
+    """A deadline_scope() around warm() bounds the warm-up requests."""
+    route = respx.post(SEARCH_URL).mock(
+        return_value=respx.MockResponse(200, json=RESULT)
+    )
+    client = _client(ResponseCache())
+
+    with deadline_scope(0.5):
+        client.warm([{"query": "a"}], rate=None)
+
+    timeout = route.calls.last.request.extensions["timeout"]
+    assert 0 < timeout["read"] <= 0.5
+    client.close()
+
+
+@respx.mock
+def test_warm_respects_rate_cap():
+    """Request starts are spaced by the rate cap."""
+    respx.post(SEARCH_URL).mock(return_value=respx.MockResponse(200, json=RESULT))
+    client = _client(ResponseCache())
+    log = [{"query": f"query {i}"} for i in range(5)]
+
+    report = client.warm(log, concurrency=5, rate=50)
+
+    assert report.warmed == 5
+    assert report.elapsed >= 4 / 50
+    client.close()
+
+
+@respx.mock
+def test_warm_stops_at_deadline():
+    """Warm-up reports partial coverage when the deadline passes."""
+
+    def slow(request):
+        time.sleep(0.05)
+        return httpx.Response(200, json=RESULT)
+
+    respx.post(SEARCH_URL).mock(side_effect=slow)
+    client = _client(ResponseCache())
+    log = [{"query": f"query {i}"} for i in range(50)]
+
+    report = client.warm(log, concurrency=1, rate=None, deadline=0.12)
+
+    assert report.completed is False
+    assert 0 < report.warmed + report.failed < 50
+    assert report.coverage < 1.0
+    client.close()
+
+
+@respx.mock
+def test_warm_counts_failures():
+    """Failed requests are counted, not raised."""
+    respx.post(SEARCH_URL).mock(return_value=respx.MockResponse(500, text="down"))
+    client = _client(ResponseCache())
+
+    report = client.warm([{"query": "a"}, {"query": "b"}], rate=None)
+
+    assert report.failed == 2
+    assert report.coverage == 0.0
+    client.close()
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_async_warm_populates_cache():
+    """Async client: warm-up fills the cache (async parity)."""
+    route = respx.post(SEARCH_URL).mock(
+        return_value=respx.MockResponse(200, json=RESULT)
+    )
+    config = ClientConfig(base_url="https://api.payelink.example", retries=0)
+    async with AsyncAgentSearchClient(api_key="test", cache=ResponseCache()) as client:
+        client._transport = AsyncTransport(config)
+
+        report = await client.warm(LOG, concurrency=2, rate=None)
+
+        assert report.warmed == 3
+        assert route.call_count == 3
+        response = await client.search("Book a flight")
+        assert response.served_locally is True
+
+
+@respx.mock
+def test_cli_reports_coverage(tmp_path, monkeypatch, capsys):
+    """The CLI warms the hot set and prints a summary."""
+    respx.post("http://127.0.0.1:8000/v1/agents/search").mock(
+        return_value=respx.MockResponse(200, json=RESULT)
+    )
+    path = tmp_path / "log.jsonl"
+    path.write_text("\n".join(json.dumps(r) for r in LOG if isinstance(r, dict)))
+    monkeypatch.setenv("PAYELINK_KEY", "test")
+
+    exit_code = main([str(path), "--top", "2", "--rate", "0", "--quiet"])
+
+    assert exit_code == 0
+    assert "Warmed 2/2 (100%)" in capsys.readouterr().out